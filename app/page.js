@@ -46,7 +46,7 @@ export default function Home() {
         <div className="container h-16 flex items-center justify-between">
           <div className="flex items-center gap-2">
             <span className="text-2xl">🇱🇰</span>
-            <span className="font-bold text-lg hidden sm:inline-block">
+            <span className="font-bold text-lg hidden sm:inline-block" data-testid="app-title">
               Tax Wizard
             </span>
           </div>
@@ -57,6 +57,7 @@ export default function Home() {
               size="sm"
               onClick={toggleLanguage}
               className="font-medium"
+              data-testid="language-toggle"
               icon={<Globe size={18} />}
             >
               {language.toUpperCase()}
@@ -66,6 +67,7 @@ export default function Home() {
               variant="ghost"
               size="sm"
               onClick={toggleTheme}
+              data-testid="theme-toggle"
               icon={theme === 'dark' ? <Sun size={18} /> : <Moon size={18} />}
             />
           </div>
@@ -28,6 +28,7 @@ export function Navigation({
             <Button
                 variant="ghost"
                 onClick={handleBack}
+                data-testid="nav-back"
                 icon={<ArrowLeft size={16} />}
             >
                 {t('btn_back', language)}
@@ -38,6 +39,7 @@ export function Navigation({
                 onClick={onNext}
                 disabled={isNextDisabled}
                 isLoading={isLoading}
+                data-testid={isLastStep ? 'nav-submit' : 'nav-next'}
                 icon={!isLoading && (isLastStep ? <Check size={16} /> : <ArrowRight size={16} />)}
             >
                 {isLastStep ? t('btn_submit', language) : t('btn_next', language)}
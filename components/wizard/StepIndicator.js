@@ -14,7 +14,7 @@ export function StepIndicator({ totalSteps = 5 }) {
     return (
         <div className="mb-8">
             <div className="flex justify-between items-center mb-2">
-                <span className="text-sm font-medium text-gray-500 dark:text-gray-400">
+                <span className="text-sm font-medium text-gray-500 dark:text-gray-400" data-testid="step-indicator">
                     {t('step_indicator', language)
                         .replace('{current}', currentStep)
                         .replace('{total}', totalSteps)}
@@ -55,6 +55,7 @@ export function Step2() {
                         <div
                             key={source.id}
                             onClick={() => toggleSource(source.id)}
+                            data-testid={`income-source-${source.id}`}
                             className={`
                 cursor-pointer p-4 rounded-lg border-2 transition-all duration-200 flex items-center gap-3
                 ${selectedSources.includes(source.id)
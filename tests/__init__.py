@@ -0,0 +1,3 @@
+"""
+Sri Lanka Tax Wizard test suite
+"""
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Managed Next.js server for the test suite
+
+Starts `next dev`, or `next build` + `next start` for production mode, on the
+port in BASE_URL, waits until it accepts connections and pre-warms `/` plus
+every `/_next/` asset the page references, so no test absorbs on-demand
+compilation. Build, startup and cold first-request times are reported
+separately from warm timings. If something already listens on the port the
+server is not started: its mode cannot be known, and a dev server left running
+would silently turn a production run into a dev run.
+
+    python -m tests.app_server --mode prod          # start, warm, report, stop
+    python -m tests.runner --server prod            # run the suite against it
+"""
+
+import argparse
+import os
+import re
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+from tests.selectors import BASE_URL
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_TIMEOUT = 120  # s; the first dev start can be slow
+REQUEST_TIMEOUT = 120  # s; covers on-demand compilation of the first request
+ASSET_RE = re.compile(r'(?:src|href)="(/_next/[^"]+)"')
+
+
+def _next_command(*args):
+    """Command line for the project's Next.js CLI"""
+    local = os.path.join(PROJECT_ROOT, 'node_modules', '.bin', 'next.cmd' if os.name == 'nt' else 'next')
+    if os.path.exists(local):
+        return [local, *args]
+    return [shutil.which('npx') or 'npx', 'next', *args]
+
+
+def fetch(url):
+    """GET `url`; return (status, body bytes, elapsed ms)"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = e.read(), e.code
+    return status, body, (time.perf_counter() - start) * 1000
+
+
+def is_listening(host, port):
+    try:
+        with socket.create_connection((host, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+class AppServer:
+    """Owns one Next.js server process for the duration of a run"""
+
+    def __init__(self, mode='dev', base_url=BASE_URL):
+        if mode not in ('dev', 'prod'):
+            raise ValueError(f"Unknown server mode {mode!r}; expected 'dev' or 'prod'")
+        self.mode = mode
+        self.base_url = base_url
+        parsed = urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.process = None
+        self.report = {'mode': mode}
+
+    def start(self):
+        """Build if needed, start the server and wait until it accepts connections
+
+        Raises RuntimeError when the port is already taken, since the mode of
+        a server the suite did not start cannot be guaranteed.
+        """
+        if is_listening(self.host, self.port):
+            raise RuntimeError(
+                f"Port {self.port} is already in use, so a {self.mode} server cannot be guaranteed; "
+                f"stop the running server, or omit --server to test it as it is")
+
+        if self.mode == 'prod':
+            start = time.perf_counter()
+            subprocess.run(_next_command('build'), cwd=PROJECT_ROOT, check=True)
+            self.report['build_s'] = time.perf_counter() - start
+
+        command = _next_command('dev' if self.mode == 'dev' else 'start', '-p', str(self.port))
+        if os.name == 'posix':
+            group = {'start_new_session': True}
+        else:
+            group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        start = time.perf_counter()
+        self.process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, **group)
+
+        deadline = time.monotonic() + READY_TIMEOUT
+        while not is_listening(self.host, self.port):
+            if self.process.poll() is not None:
+                raise RuntimeError(f"next {self.mode} exited with status {self.process.returncode}")
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"next {self.mode} did not listen on port {self.port} within {READY_TIMEOUT}s")
+            time.sleep(0.1)
+        self.report['startup_s'] = time.perf_counter() - start
+        return self
+
+    def prewarm(self, workers=8):
+        """Request `/` and every /_next/ asset it references; record cold vs warm times
+
+        In dev mode the first request compiles the route, so `cold_request_ms`
+        minus `warm_request_ms` is the on-demand compile cost.
+        """
+        status, body, cold_ms = fetch(self.base_url)
+        if status != 200:
+            raise RuntimeError(f"GET {self.base_url} returned {status} while pre-warming")
+        assets = sorted(set(ASSET_RE.findall(body.decode('utf-8', 'replace'))))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda path: fetch(urljoin(self.base_url, path)), assets))
+        failed = [path for path, (code, _, _) in zip(assets, results) if code != 200]
+        if failed:
+            raise RuntimeError(f"Pre-warming failed for {', '.join(failed)}")
+
+        _, _, warm_ms = fetch(self.base_url)
+        self.report.update(
+            cold_request_ms=cold_ms,
+            warm_request_ms=warm_ms,
+            assets=len(assets),
+            assets_ms=(time.perf_counter() - start) * 1000,
+        )
+        return self
+
+    def stop(self):
+        """Terminate the server and everything it spawned (no-op if not ours)"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        if os.name == 'posix':
+            os.killpg(self.process.pid, signal.SIGTERM)
+        else:
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(self.process.pid)], capture_output=True)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            if os.name == 'posix':
+                os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+    def print_report(self):
+        report = self.report
+        print(f"App server ({report['mode']}) at {self.base_url}")
+        if 'build_s' in report:
+            print(f"  next build:           {report['build_s']:8.1f} s")
+        if 'startup_s' in report:
+            print(f"  startup to listening: {report['startup_s']:8.1f} s")
+        if 'cold_request_ms' in report:
+            print(f"  cold GET /:           {report['cold_request_ms']:8.1f} ms")
+            print(f"  warm GET /:           {report['warm_request_ms']:8.1f} ms")
+            print(f"  {report['assets']} assets pre-warmed in {report['assets_ms']:.1f} ms")
+
+
+@contextmanager
+def managed_server(mode=None, base_url=BASE_URL):
+    """Run the enclosed block against a started, pre-warmed server
+
+    With `mode=None` nothing is managed: the suite uses whatever already runs.
+    """
+    if mode is None:
+        yield None
+        return
+    server = AppServer(mode, base_url).start()
+    try:
+        server.prewarm()
+        server.print_report()
+        yield server
+    finally:
+        server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start, pre-warm and time the Next.js server")
+    parser.add_argument('--mode', choices=['dev', 'prod'], default='prod')
+    parser.add_argument('--keep', action='store_true', help="leave the server running (Ctrl+C to stop)")
+    args = parser.parse_args(argv)
+
+    try:
+        with managed_server(args.mode) as server:
+            if args.keep:
+                print("Server running; press Ctrl+C to stop")
+                try:
+                    server.process.wait()
+                except KeyboardInterrupt:
+                    pass
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Process-wide LRU cache of static assets, shared by every browser context
+
+Each new context starts with an empty HTTP cache, so every test re-downloads
+the same JS chunks, CSS, fonts and favicon. `AssetCache.install(context)`
+routes those requests through one in-memory LRU instead: the first request
+for a URL goes to the server, later ones in any context of this process are
+fulfilled from memory. Only `/_next/static/**` (content-hashed in production
+builds, and unchanged for the length of a run in dev) and `/favicon.ico` are
+cached; pages and everything else go to the server as before.
+
+BrowserSession installs the shared `ASSET_CACHE` on every context unless
+asked not to: the benchmark opts out, since cached assets would make it
+measure this cache instead of the server. Set ASSET_CACHE=off to disable it,
+ASSET_CACHE_MB to change the size limit.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_MB = 64
+CACHEABLE_PREFIXES = ('/_next/static/',)
+CACHEABLE_PATHS = {'/favicon.ico'}
+
+# Bodies are stored decoded, so these no longer describe them
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+def fulfill_headers(headers):
+    """`headers` without the ones that describe the original encoding or connection"""
+    return {name: value for name, value in headers.items()
+            if name.lower() not in DROPPED_HEADERS and not name.startswith(':')}
+
+
+class AssetCache:
+    """Size-limited LRU of static responses, with hit/miss accounting"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # url -> (status, headers, body)
+        self._lock = threading.Lock()  # the async matrix runs its own loop thread
+
+    @staticmethod
+    def cacheable(request):
+        if request.method != 'GET':
+            return False
+        path = urlsplit(request.url).path
+        return path in CACHEABLE_PATHS or path.startswith(CACHEABLE_PREFIXES)
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            self.bytes_saved += len(entry[2])
+            return entry
+
+    def put(self, url, status, headers, body):
+        """Store a 200 response, evicting least recently used entries to fit"""
+        if status != 200 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if url in self._entries:
+                return
+            self._entries[url] = (status, headers, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def install(self, context):
+        """Route the cacheable requests of a sync-API context through the cache"""
+        def handle(route):
+            request = route.request
+            if not self.cacheable(request):
+                route.fallback()
+                return
+            entry = self.get(request.url)
+            if entry is not None:
+                route.fulfill(status=entry[0], headers=entry[1], body=entry[2])
+                return
+            response = route.fetch()
+            body = response.body()
+            headers = fulfill_headers(response.headers)
+            self.put(request.url, response.status, headers, body)
+            route.fulfill(status=response.status, headers=headers, body=body)
+        context.route('**/*', handle)
+
+    async def install_async(self, context):
+        """`install` for an async-API context"""
+        async def handle(route):
+            request = route.request
+            if not self.cacheable(request):
+                await route.fallback()
+                return
+            entry = self.get(request.url)
+            if entry is not None:
+                await route.fulfill(status=entry[0], headers=entry[1], body=entry[2])
+                return
+            response = await route.fetch()
+            body = await response.body()
+            headers = fulfill_headers(response.headers)
+            self.put(request.url, response.status, headers, body)
+            await route.fulfill(status=response.status, headers=headers, body=body)
+        await context.route('**/*', handle)
+
+    def stats(self):
+        """{'hits', 'misses', 'bytes_saved', 'evictions', 'entries', 'size'}"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size,
+            }
+
+
+def describe(stats):
+    """One-line summary of a stats dict"""
+    requests = stats['hits'] + stats['misses']
+    ratio = stats['hits'] / requests if requests else 0.0
+    return (f"Asset cache: {stats['hits']}/{requests} hits ({ratio:.0%}), "
+            f"{stats['bytes_saved'] / 1e6:.1f} MB not re-downloaded, {stats['evictions']} evictions")
+
+
+ASSET_CACHE = AssetCache(int(float(os.environ.get('ASSET_CACHE_MB', DEFAULT_MAX_MB)) * 1024 * 1024))
+ENABLED = os.environ.get('ASSET_CACHE') != 'off'
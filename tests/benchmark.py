@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Page-load and step-transition performance benchmark
+
+Loads the app N times in fresh browser contexts and drives Step 1 -> 5 on each
+run, collecting Navigation Timing, FCP, LCP and click-to-new-step-rendered
+latency. Medians and p95s are compared against a committed baseline and the
+run fails when any metric regresses beyond the tolerance.
+
+    python -m tests.benchmark --runs 20
+    python -m tests.benchmark --runs 20 --update-baseline   # on the reference machine
+    python -m tests.benchmark --runs 20 --server prod       # against a managed, pre-warmed build
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+
+from tests import app_server
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Records every LCP candidate; the last one before input is the LCP
+LCP_OBSERVER_JS = """
+window.__lcp = null;
+new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) window.__lcp = entry.startTime;
+}).observe({ type: 'largest-contentful-paint', buffered: true });
+"""
+
+PAGE_LOAD_METRICS_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    return {
+        ttfb: nav.responseStart,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load_event: nav.loadEventEnd,
+        fcp: fcp ? fcp.startTime : null,
+        lcp: window.__lcp,
+    };
+}"""
+
+# Clicks Next in-page and resolves once the next step has been painted, so the
+# measurement excludes the Python <-> browser round-trip. Throws if the step
+# has not changed within `timeout` ms (a validation error or a crash).
+STEP_TRANSITION_JS = """async ([stepSelector, target, timeout]) => {
+    const currentStep = %s;
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => resolve()));
+
+    const start = performance.now();
+    document.querySelector('button.btn-primary').click();
+    while (currentStep(stepSelector) !== target) {
+        if (performance.now() - start > timeout) {
+            throw new Error(`Step ${target} not rendered within ${timeout} ms (still on step ${currentStep(stepSelector)})`);
+        }
+        await nextFrame();
+    }
+    await nextFrame();  // the frame that paints the new step
+    return performance.now() - start;
+}""" % Waits.STEP_JS
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure_run():
+    """Load the app once and drive Step 1 -> 5; return {metric: milliseconds}"""
+    # Every asset comes from the server and the app animates, as for a first-time visitor
+    with BrowserSession.new_page(cache_assets=False, fast_render=False) as page:
+        page.add_init_script(LCP_OBSERVER_JS)
+        page.goto(BASE_URL)
+        TestHelpers.wait_for_navigation(page)
+        metrics = page.evaluate(PAGE_LOAD_METRICS_JS)
+
+        TestHelpers.fill_step1_form(page)
+        for step in range(1, 5):
+            metrics[f'step_{step}_to_{step + 1}'] = page.evaluate(
+                STEP_TRANSITION_JS, [Selectors.STEP_INDICATOR, step + 1, Waits.DEFAULT_TIMEOUT]
+            )
+    return metrics
+
+
+def summarize(runs):
+    """Reduce per-run samples to {metric: {'median', 'p95'}}"""
+    summary = {}
+    for metric in runs[0]:
+        samples = [run[metric] for run in runs if run.get(metric) is not None]
+        if samples:
+            summary[metric] = {
+                'median': round(statistics.median(samples), 2),
+                'p95': round(percentile(samples, 95), 2),
+            }
+    return summary
+
+
+def compare(summary, baseline, tolerance, slack_ms):
+    """Return (metric, stat, current, baseline) for every regression
+
+    A stat regresses when it exceeds baseline * (1 + tolerance) + slack_ms; the
+    absolute slack keeps millisecond-scale metrics from failing on jitter.
+    """
+    regressions = []
+    for metric, stats in summary.items():
+        for stat, value in stats.items():
+            reference = baseline.get(metric, {}).get(stat)
+            if reference is not None and value > reference * (1 + tolerance) + slack_ms:
+                regressions.append((metric, stat, value, reference))
+    return regressions
+
+
+def print_summary(summary, baseline):
+    print(f"{'metric':<22}{'median':>10}{'p95':>10}{'base med':>11}{'base p95':>11}")
+    for metric, stats in summary.items():
+        base = baseline.get(metric, {})
+        print(f"{metric:<22}{stats['median']:>10.1f}{stats['p95']:>10.1f}"
+              f"{base.get('median', float('nan')):>11.1f}{base.get('p95', float('nan')):>11.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page load and step transitions")
+    parser.add_argument('--runs', type=int, default=10, help="measured runs (default: 10)")
+    parser.add_argument('--warmup', type=int, default=1,
+                        help="unmeasured runs first, e.g. to absorb dev-server compilation")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative regression over baseline (default: 0.2 = 20%%)")
+    parser.add_argument('--slack-ms', type=float, default=5.0,
+                        help="allowed absolute regression in ms on top of the tolerance")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON path")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="write this run's results as the new baseline")
+    parser.add_argument('--server', choices=['dev', 'prod'],
+                        help="start and pre-warm a server for the run (prod: next build + next start)")
+    args = parser.parse_args(argv)
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        # Without a baseline there is nothing to gate on; passing would hide that
+        print(f"❌ No baseline at {args.baseline}; record one with --update-baseline on the reference setup")
+        return 1
+
+    try:
+        with app_server.managed_server(args.server):
+            for _ in range(args.warmup):
+                measure_run()
+            runs = [measure_run() for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    summary = summarize(runs)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'metrics': summary}, f, indent=4)
+            f.write('\n')
+        print_summary(summary, summary)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['metrics']
+    print_summary(summary, baseline)
+
+    regressions = compare(summary, baseline, args.tolerance, args.slack_ms)
+    for metric, stat, value, reference in regressions:
+        print(f"❌ {metric} {stat}: {value:.1f} ms vs baseline {reference:.1f} ms")
+    if regressions:
+        return 1
+    print(f"✅ No regressions beyond {args.tolerance:.0%} (+{args.slack_ms:g} ms) over {args.runs} runs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Persistent Chromium server shared by test processes
+
+`start` runs Playwright's `launch-server` (BrowserType.launchServer) as a
+detached daemon and records its WebSocket endpoint in a state file.
+BrowserSession connects to that warm browser when the file exists and falls
+back to launching Chromium locally when no server answers, so separate test
+processes stop paying browser startup each time.
+
+    python -m tests.browser_server start
+    python -m tests.browser_server status
+    python -m tests.browser_server benchmark --runs 5
+    python -m tests.browser_server stop
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+
+STATE_PATH = os.environ.get(
+    'BROWSER_SERVER_STATE', os.path.join(tempfile.gettempdir(), 'srilankataxwizard-browser-server.json'))
+LOG_PATH = os.path.splitext(STATE_PATH)[0] + '.log'
+CONNECT_TIMEOUT = 2000  # ms; an unreachable endpoint fails fast with connection refused
+START_TIMEOUT = 30  # s
+
+
+def read_state():
+    """The running server's state ({pid, ws_endpoint, started}) or None"""
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def endpoint():
+    """WebSocket endpoint to connect to, or None to launch locally
+
+    Set BROWSER_SERVER=off to always launch a local browser.
+    """
+    if os.environ.get('BROWSER_SERVER') == 'off':
+        return None
+    state = read_state()
+    return state['ws_endpoint'] if state else None
+
+
+def connect(playwright):
+    """Connect to the warm server if one is recorded and reachable, else None"""
+    ws_endpoint = endpoint()
+    if ws_endpoint is None:
+        return None
+    try:
+        return playwright.chromium.connect(ws_endpoint, timeout=CONNECT_TIMEOUT)
+    except PlaywrightError:
+        return None
+
+
+def start(headless=True):
+    """Launch the server daemon and wait for its endpoint; return its state"""
+    state = read_state()
+    if state and _reachable(state['ws_endpoint']):
+        return state
+
+    config_path = os.path.splitext(STATE_PATH)[0] + '.config.json'
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({'headless': headless}, f)
+
+    if os.name == 'posix':
+        detach = {'start_new_session': True}
+    else:
+        detach = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+    with open(LOG_PATH, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'playwright', 'launch-server', '--browser', 'chromium', '--config', config_path],
+            stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, **detach,
+        )
+
+    # launch-server prints the endpoint once the browser is up
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        with open(LOG_PATH, 'r', encoding='utf-8') as log:
+            for line in log:
+                if line.startswith('ws://'):
+                    state = {'pid': process.pid, 'ws_endpoint': line.strip(), 'started': time.time()}
+                    with open(STATE_PATH, 'w', encoding='utf-8') as f:
+                        json.dump(state, f)
+                    return state
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+
+    _terminate(process.pid)
+    with open(LOG_PATH, 'r', encoding='utf-8') as log:
+        raise RuntimeError(f"Browser server did not start:\n{log.read()}")
+
+
+def stop():
+    """Stop the daemon and forget its endpoint; return whether one was recorded"""
+    state = read_state()
+    if state is None:
+        return False
+    _terminate(state['pid'])
+    os.remove(STATE_PATH)
+    return True
+
+
+def _terminate(pid):
+    # `python -m playwright` runs the Node driver as a child; signal the whole group
+    try:
+        if os.name == 'posix':
+            os.killpg(pid, signal.SIGTERM)
+        else:
+            os.kill(pid, signal.CTRL_BREAK_EVENT)
+    except OSError:
+        pass
+
+
+def _reachable(ws_endpoint):
+    with sync_playwright() as playwright:
+        try:
+            playwright.chromium.connect(ws_endpoint, timeout=CONNECT_TIMEOUT).close()
+            return True
+        except PlaywrightError:
+            return False
+
+
+def benchmark(runs=5):
+    """Median ms for a process's browser setup: local launch vs warm connect
+
+    Each sample includes starting Playwright, getting a browser and opening
+    one context, i.e. what every test process pays before its first test.
+    """
+    ws_endpoint = endpoint()
+    if ws_endpoint is None:
+        raise RuntimeError("No browser server running; start one with: python -m tests.browser_server start")
+
+    def sample(get_browser):
+        start_time = time.perf_counter()
+        with sync_playwright() as playwright:
+            browser = get_browser(playwright)
+            browser.new_context().close()
+            elapsed = (time.perf_counter() - start_time) * 1000
+            browser.close()
+        return elapsed
+
+    cold = [sample(lambda p: p.chromium.launch(headless=True)) for _ in range(runs)]
+    warm = [sample(lambda p: p.chromium.connect(ws_endpoint)) for _ in range(runs)]
+    return statistics.median(cold), statistics.median(warm)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the shared Chromium server")
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'benchmark'])
+    parser.add_argument('--headed', action='store_true', help="start a visible browser")
+    parser.add_argument('--runs', type=int, default=5, help="samples per mode for benchmark")
+    args = parser.parse_args(argv)
+
+    if args.command == 'start':
+        state = start(headless=not args.headed)
+        print(f"✅ Browser server running (pid {state['pid']}) at {state['ws_endpoint']}")
+    elif args.command == 'stop':
+        print("✅ Browser server stopped" if stop() else "No browser server recorded")
+    elif args.command == 'status':
+        state = read_state()
+        if state is None:
+            print("No browser server recorded; tests launch Chromium locally")
+            return 1
+        alive = _reachable(state['ws_endpoint'])
+        print(f"{'✅' if alive else '❌'} pid {state['pid']} at {state['ws_endpoint']} "
+              f"({'reachable' if alive else 'not reachable; tests fall back to a local launch'})")
+        return 0 if alive else 1
+    elif args.command == 'benchmark':
+        cold, warm = benchmark(args.runs)
+        print(f"Local launch:  {cold:8.1f} ms")
+        print(f"Warm connect:  {warm:8.1f} ms")
+        print(f"✅ Saves {cold - warm:.1f} ms ({(cold - warm) / cold:.0%}) per test process")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
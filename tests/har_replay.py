@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Offline HAR record/replay of the app
+
+`record` walks the wizard once against a running server (every step, every
+language, both themes) with Playwright's HAR recorder on, then stores a
+manifest of SHA-256 hashes of the app's source files next to the HAR.
+
+`enable` makes every BrowserSession context serve requests to BASE_URL from
+an in-memory index of that HAR through `context.route` (contexts created with
+the async API call `install_async`), so UI-logic tests run with no Next.js
+server at all. The HAR is parsed once per process, not
+once per context as `route_from_har` would. Replay refuses a recording whose
+manifest no longer matches the sources; record again after changing the app.
+
+    python -m tests.har_replay record --server prod
+    python -m tests.har_replay status
+    python -m tests.runner --replay
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from tests.app_server import managed_server
+from tests.asset_cache import fulfill_headers
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HAR_PATH = os.path.join(PROJECT_ROOT, 'tests', 'recordings', 'wizard.har')
+
+# Everything that changes what the server sends
+SOURCE_DIRS = ['app', 'components', 'context', 'data', 'features', 'public', 'utils']
+SOURCE_FILES = ['package.json', 'package-lock.json', 'next.config.mjs', 'jsconfig.json']
+
+_indexes = {}
+_enabled = set()
+_active = None  # index served by `enable`, for install_async
+misses = []  # URLs requested during replay that the recording lacks
+
+
+def manifest_path(har_path):
+    return os.path.splitext(har_path)[0] + '.sources.json'
+
+
+def source_hashes(root=PROJECT_ROOT):
+    """{relative path: sha256} for every file the recording depends on"""
+    paths = [os.path.join(root, name) for name in SOURCE_FILES if os.path.exists(os.path.join(root, name))]
+    for directory in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, directory)):
+            dirnames.sort()
+            paths.extend(os.path.join(dirpath, filename) for filename in sorted(filenames))
+    hashes = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            hashes[os.path.relpath(path, root).replace(os.sep, '/')] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def stale_sources(har_path=HAR_PATH):
+    """Source files added, removed or changed since the recording (empty if fresh)"""
+    with open(manifest_path(har_path), 'r', encoding='utf-8') as f:
+        recorded = json.load(f)['sources']
+    current = source_hashes()
+    return sorted(path for path in recorded.keys() | current.keys() if recorded.get(path) != current.get(path))
+
+
+def _walk_wizard(page):
+    """Visit every step, language and theme so every chunk the app loads is requested"""
+    page.goto(BASE_URL)
+    Waits.for_app_ready(page)
+    TestHelpers.fill_step1_form(page)
+    for step in range(2, 6):
+        if step == 3:
+            page.locator('[data-testid="income-source-employment"]').click()
+        page.locator('[data-testid="nav-next"]').click()
+        Waits.for_step(page, step)
+    for language in ('si', 'ta', 'en'):
+        page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
+        Waits.for_language(page, language)
+    theme = TestHelpers.get_theme(page)
+    page.locator(Selectors.THEME_TOGGLE).first.click()
+    Waits.for_theme_change(page, theme)
+    page.goto(f"{BASE_URL}/favicon.ico")
+
+
+def record(har_path=HAR_PATH):
+    """Record a HAR of everything the wizard loads and its source manifest"""
+    os.makedirs(os.path.dirname(har_path), exist_ok=True)
+    context = BrowserSession.browser().new_context(
+        record_har_path=har_path,
+        record_har_content='embed',
+        record_har_url_filter=f"{BASE_URL}/**",
+    )
+    try:
+        _walk_wizard(context.new_page())
+    finally:
+        context.close()  # writes the HAR
+    with open(manifest_path(har_path), 'w', encoding='utf-8') as f:
+        json.dump({'base_url': BASE_URL, 'recorded': time.time(), 'sources': source_hashes()}, f, indent=4)
+        f.write('\n')
+    _indexes.pop(har_path, None)
+    return load_index(har_path)
+
+
+def _strip(url):
+    """URL without its fragment, and without its query for the fallback lookup"""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(fragment='')), urlunsplit(parts._replace(query='', fragment=''))
+
+
+def load_index(har_path=HAR_PATH):
+    """{'exact': {(method, url): response}, 'path': {(method, url without query): response}}
+
+    Parsed once per process and kept until the file changes. For repeated
+    URLs the last recorded response wins.
+    """
+    stamp = os.stat(har_path).st_mtime_ns
+    cached = _indexes.get(har_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(har_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)['log']['entries']
+    index = {'exact': {}, 'path': {}}
+    for entry in entries:
+        request, response = entry['request'], entry['response']
+        content = response.get('content', {})
+        text = content.get('text', '')
+        body = base64.b64decode(text) if content.get('encoding') == 'base64' else text.encode('utf-8')
+        recorded = {
+            'status': response['status'],
+            'headers': fulfill_headers({h['name']: h['value'] for h in response['headers']}),
+            'body': body,
+        }
+        exact, path = _strip(request['url'])
+        index['exact'][(request['method'], exact)] = recorded
+        index['path'][(request['method'], path)] = recorded
+    _indexes[har_path] = (stamp, index)
+    return index
+
+
+def _response(index, request):
+    """Keyword arguments for `route.fulfill`: the recorded response, or a 404 miss"""
+    exact, path = _strip(request.url)
+    recorded = index['exact'].get((request.method, exact)) or index['path'].get((request.method, path))
+    if recorded is None:
+        misses.append(request.url)
+        return {'status': 404, 'content_type': 'text/plain', 'body': f"Not in HAR recording: {request.url}"}
+    return {'status': recorded['status'], 'headers': recorded['headers'], 'body': recorded['body']}
+
+
+def _handler(index):
+    def handle(route):
+        route.fulfill(**_response(index, route.request))
+    return handle
+
+
+async def install_async(context):
+    """Route an async-API context through the enabled recording (no-op when replay is off)"""
+    if _active is None:
+        return
+    index = _active
+
+    async def handle(route):
+        await route.fulfill(**_response(index, route.request))
+    await context.route(f"{BASE_URL}/**", handle)
+
+
+def enable(har_path=HAR_PATH, allow_stale=False):
+    """Serve BASE_URL from the recording in every new BrowserSession context
+
+    Raises RuntimeError when the recording is missing or older than the
+    sources, unless `allow_stale`.
+    """
+    if har_path in _enabled:
+        return  # forked pool workers inherit the parent's hooks
+    if not os.path.exists(har_path):
+        raise RuntimeError(f"No recording at {har_path}; run: python -m tests.har_replay record")
+    changed = stale_sources(har_path)
+    if changed and not allow_stale:
+        shown = ', '.join(changed[:5]) + (f" and {len(changed) - 5} more" if len(changed) > 5 else '')
+        raise RuntimeError(f"HAR recording is stale ({shown} changed); run: python -m tests.har_replay record")
+    global _active
+    _active = load_index(har_path)
+    handler = _handler(_active)
+    BrowserSession.context_hooks.append(lambda context: context.route(f"{BASE_URL}/**", handler))
+    _enabled.add(har_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or inspect the offline HAR recording")
+    parser.add_argument('command', choices=['record', 'status'])
+    parser.add_argument('--har', default=HAR_PATH, help="HAR path (default: tests/recordings/wizard.har)")
+    parser.add_argument('--server', choices=['dev', 'prod'], help="start and pre-warm a server to record from")
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        try:
+            with managed_server(args.server):
+                index = record(args.har)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        size = sum(len(r['body']) for r in index['exact'].values())
+        print(f"✅ Recorded {len(index['exact'])} responses ({size / 1e6:.2f} MB) to {args.har}")
+        return 0
+
+    if not os.path.exists(args.har):
+        print(f"No recording at {args.har}")
+        return 1
+    changed = stale_sources(args.har)
+    if changed:
+        print(f"❌ Stale: {len(changed)} source files changed since recording")
+        for path in changed:
+            print(f"   {path}")
+        return 1
+    print(f"✅ {args.har} is up to date with the sources ({len(load_index(args.har)['exact'])} responses)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP load generator for the app's routes and static assets
+
+Replays page visits the way a browser with a cold cache makes them: the HTML
+for `/`, then every JS chunk and stylesheet it references, the fonts those
+stylesheets load and `favicon.ico`. A share of visits can model returning
+users whose cache already holds the assets (HTML only). Requests go over a
+keep-alive connection pool on plain asyncio streams, so nothing beyond the
+standard library and a local server is needed.
+
+Visits arrive either as a Poisson stream at --rate per second (open model) or
+from --concurrency users looping back to back (closed model). Throughput,
+latency percentiles, bytes and error rates are reported per route (request
+path) and rolled up per route kind.
+
+    python -m tests.load_generator --server prod --duration 30 --rate 50
+    python -m tests.load_generator --concurrency 32 --cached-ratio 0.7
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+from tests.app_server import ASSET_RE, managed_server
+from tests.benchmark import percentile
+from tests.selectors import BASE_URL
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DURATION = 10  # s
+REQUEST_TIMEOUT = 30  # s
+
+# next/font serves the font files referenced from the generated CSS
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?(/_next/[^)'"]+)""")
+FONT_EXTENSIONS = ('.woff2', '.woff', '.ttf', '.otf')
+KIND_ORDER = ('html', 'js', 'css', 'font', 'favicon', 'other')
+NO_BODY_STATUSES = (204, 304)
+
+
+def route_kind(path):
+    """Reporting bucket for a request path"""
+    path = path.split('?', 1)[0]
+    if path == '/':
+        return 'html'
+    if path == '/favicon.ico':
+        return 'favicon'
+    if path.endswith('.js'):
+        return 'js'
+    if path.endswith('.css'):
+        return 'css'
+    if path.endswith(FONT_EXTENSIONS):
+        return 'font'
+    return 'other'
+
+
+class HTTPPool:
+    """At most `size` keep-alive HTTP/1.1 connections to one host"""
+
+    def __init__(self, host, port, size=DEFAULT_CONCURRENCY):
+        self.host = host
+        self.port = port
+        self.opened = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def get(self, path, compressed=True):
+        """GET `path`; return (status, body)
+
+        A reused connection the server has meanwhile closed is replaced once.
+        """
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._open()
+            try:
+                status, body, keep_alive = await self._exchange(connection, path, compressed)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                connection = await self._open()
+                try:
+                    status, body, keep_alive = await self._exchange(connection, path, compressed)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+            return status, body
+
+    async def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _exchange(self, connection, path, compressed):
+        reader, writer = connection
+        request = f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n"
+        if compressed:
+            request += "Accept-Encoding: gzip, deflate, br\r\n"
+        writer.write((request + "\r\n").encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before the response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while (size := int((await reader.readline()).split(b';')[0], 16)) > 0:
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            while await reader.readline() not in (b'\r\n', b'\n', b''):
+                pass  # trailers
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        elif status in NO_BODY_STATUSES or 100 <= status < 200:
+            body = b''
+        else:
+            # Neither length nor chunked: the body ends when the server closes
+            # the connection (RFC 9112 6.3), so it cannot be kept alive anyway
+            return status, await reader.read(), False
+        return status, body, headers.get('connection', '').lower() != 'close'
+
+
+def _route_order(path):
+    return KIND_ORDER.index(route_kind(path)), path
+
+
+def _summarize(latencies, errors, size, elapsed):
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 2),
+        'errors': errors,
+        'error_rate': round(errors / len(latencies), 4),
+        'bytes': size,
+        'p50': round(percentile(latencies, 50), 2),
+        'p90': round(percentile(latencies, 90), 2),
+        'p99': round(percentile(latencies, 99), 2),
+        'max': round(max(latencies), 2),
+    }
+
+
+class LoadStats:
+    """Per-request samples grouped by request path"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def record(self, path, ms, ok, size):
+        entry = self.samples.setdefault(path, {'latencies': [], 'errors': 0, 'bytes': 0})
+        entry['latencies'].append(ms)
+        entry['bytes'] += size
+        if not ok:
+            entry['errors'] += 1
+
+    def report(self, elapsed):
+        """{path: {kind, requests, rps, errors, error_rate, bytes, p50, p90, p99, max}}, ms"""
+        return {path: {'kind': route_kind(path), **_summarize(entry['latencies'], entry['errors'],
+                                                              entry['bytes'], elapsed)}
+                for path, entry in sorted(self.samples.items(), key=lambda item: _route_order(item[0]))}
+
+    def by_kind(self, elapsed):
+        """The same figures rolled up per route kind (html, js, css, font, favicon)"""
+        kinds = {}
+        for path, entry in self.samples.items():
+            merged = kinds.setdefault(route_kind(path), {'latencies': [], 'errors': 0, 'bytes': 0})
+            merged['latencies'].extend(entry['latencies'])
+            merged['errors'] += entry['errors']
+            merged['bytes'] += entry['bytes']
+        return {kind: _summarize(kinds[kind]['latencies'], kinds[kind]['errors'], kinds[kind]['bytes'], elapsed)
+                for kind in sorted(kinds, key=KIND_ORDER.index)}
+
+
+async def discover(pool):
+    """Paths a cold-cache visit requests after `/`: chunks, CSS, fonts, favicon"""
+    status, body = await pool.get('/', compressed=False)
+    if status != 200:
+        raise RuntimeError(f"GET / returned {status}; is the server running at {BASE_URL}?")
+    assets = set(ASSET_RE.findall(body.decode('utf-8', 'replace')))
+    for path in [p for p in assets if route_kind(p) == 'css']:
+        status, css = await pool.get(path, compressed=False)
+        if status == 200:
+            assets.update(CSS_URL_RE.findall(css.decode('utf-8', 'replace')))
+    assets.add('/favicon.ico')
+    return sorted(assets, key=_route_order)
+
+
+async def _request(pool, stats, path):
+    start = time.perf_counter()
+    ok, size = False, 0
+    try:
+        status, body = await asyncio.wait_for(pool.get(path), REQUEST_TIMEOUT)
+        ok, size = status < 400, len(body)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+        pass
+    # Includes time queued for a pooled connection, as a browser would see it
+    stats.record(path, (time.perf_counter() - start) * 1000, ok, size)
+
+
+async def visit(pool, stats, assets, cached):
+    """One page view: the HTML, then (unless cached) its assets in parallel"""
+    await _request(pool, stats, '/')
+    if not cached:
+        await asyncio.gather(*(_request(pool, stats, path) for path in assets))
+
+
+async def run_load(base_url=BASE_URL, duration=DEFAULT_DURATION, concurrency=DEFAULT_CONCURRENCY,
+                   rate=None, cached_ratio=0.0, seed=None):
+    """Generate load for `duration` seconds; return (report, summary)
+
+    `report` is {'routes': per-path figures, 'kinds': per route kind figures}.
+
+    With `rate`, visits arrive as a Poisson process at that many per second
+    and `concurrency` only bounds connections; without it, `concurrency`
+    users each start a new visit as soon as the previous one finishes.
+    """
+    parsed = urlparse(base_url)
+    pool = HTTPPool(parsed.hostname, parsed.port or 80, concurrency)
+    rng = random.Random(seed)
+    stats = LoadStats()
+    try:
+        assets = await discover(pool)
+        start = time.perf_counter()
+        deadline = start + duration
+        visits = 0
+
+        if rate:
+            tasks = set()
+            next_arrival = start
+            while next_arrival < deadline:
+                await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+                task = asyncio.create_task(visit(pool, stats, assets, rng.random() < cached_ratio))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                visits += 1
+                next_arrival += rng.expovariate(rate)
+            await asyncio.gather(*tasks)
+        else:
+            async def user():
+                nonlocal visits
+                while time.perf_counter() < deadline:
+                    await visit(pool, stats, assets, rng.random() < cached_ratio)
+                    visits += 1
+            await asyncio.gather(*(user() for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - start
+    finally:
+        await pool.close()
+
+    report = {'routes': stats.report(elapsed), 'kinds': stats.by_kind(elapsed)}
+    total = sum(entry['requests'] for entry in report['kinds'].values())
+    errors = sum(entry['errors'] for entry in report['kinds'].values())
+    summary = {
+        'elapsed': round(elapsed, 2),
+        'visits': visits,
+        'requests': total,
+        'rps': round(total / elapsed, 2),
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'connections': pool.opened,
+        'assets_per_visit': len(assets),
+    }
+    return report, summary
+
+
+def _print_table(title, rows):
+    width = max([len(title)] + [len(name) for name in rows])
+    print(f"{title:<{width}}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'errors':>8}{'MB':>8}")
+    for name, entry in rows.items():
+        print(f"{name:<{width}}{entry['requests']:>10}{entry['rps']:>9.1f}{entry['p50']:>9.1f}{entry['p90']:>9.1f}"
+              f"{entry['p99']:>9.1f}{entry['max']:>9.1f}{entry['error_rate']:>8.1%}{entry['bytes'] / 1e6:>8.2f}")
+
+
+def print_report(report, summary):
+    _print_table('route', report['routes'])
+    print()
+    _print_table('kind', report['kinds'])
+    print(f"{summary['visits']} visits, {summary['requests']} requests in {summary['elapsed']:.2f}s "
+          f"({summary['rps']:.1f} req/s) over {summary['connections']} connections; "
+          f"{summary['assets_per_visit']} assets per cold visit, error rate {summary['error_rate']:.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate HTTP load against the app")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help=f"seconds of load (default: {DEFAULT_DURATION})")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"pooled connections, and users in closed mode (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, help="visits per second as a Poisson stream (default: closed loop)")
+    parser.add_argument('--cached-ratio', type=float, default=0.0,
+                        help="share of visits from a warm browser cache that fetch only the HTML")
+    parser.add_argument('--seed', type=int, help="seed for arrivals and cached visits")
+    parser.add_argument('--server', choices=['dev', 'prod'], help="start and pre-warm a server for the run")
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help="exit non-zero above this overall error rate (default: 0)")
+    parser.add_argument('--output', help="write the per-route and per-kind report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        with managed_server(args.server):
+            report, summary = asyncio.run(run_load(
+                duration=args.duration, concurrency=args.concurrency, rate=args.rate,
+                cached_ratio=args.cached_ratio, seed=args.seed,
+            ))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    print_report(report, summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, **report}, f, indent=4)
+            f.write('\n')
+        print(f"✅ Report written to {args.output}")
+    return 1 if summary['error_rate'] > args.max_error_rate else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
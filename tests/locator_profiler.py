@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Locator performance and ambiguity profiler for `Selectors`
+
+Opens the app on every step x language x viewport, resolves every selector
+constant on each page and records resolution time and match counts. A
+selector is flagged when it is ambiguous (several visible matches), slow
+(resolution cost above --slow-ms), relies on the text/layout engines or on
+position (:has-text, :near, nth-of-type), or never matches at all.
+
+For each selector a replacement is proposed from the elements it actually
+matched: their shared data-testid, else their id. Replacements are checked on
+the same pages and kept only if they match exactly one element wherever the
+original matched something.
+
+    python -m tests.locator_profiler --output selector_profile.json
+"""
+
+import argparse
+import itertools
+import json
+import re
+import statistics
+import sys
+import time
+
+from tests.selectors import BASE_URL, TEST_DATA_PATH, BrowserSession, Selectors, TestHelpers
+from tests.taxpayer_data import load_test_data
+
+# Selectors expected to match several elements
+PLURAL = {'ERROR_MESSAGE'}
+
+# Selectors with no element in the app that supports what tests do with them.
+# Tests call .check()/.is_checked() on these checkbox locators, but Step 2
+# renders income sources as clickable cards with no checkbox input, so no
+# locator can stand in for them; the tests themselves have to change.
+NO_EQUIVALENT = {
+    'INCOME_SOURCE_EMPLOYMENT': 'tests check a checkbox; Step 2 renders clickable income-source cards',
+    'INCOME_SOURCE_BUSINESS': 'tests check a checkbox; Step 2 renders clickable income-source cards',
+}
+
+FRAGILE_RE = re.compile(r":(?:has-text|text|text-is|text-matches|near|left-of|right-of|above|below)\(|nth-of-type|nth-child|>> nth=")
+
+MATCH_JS = """(elements) => elements.map((el) => ({
+    testid: el.getAttribute('data-testid'),
+    id: el.id || null,
+    tag: el.tagName.toLowerCase(),
+    visible: el.getClientRects().length > 0,
+}))"""
+
+DEFAULT_SAMPLES = 5
+DEFAULT_SLOW_MS = 1.0
+
+
+def selector_constants():
+    """{name: selector} for every selector constant on Selectors"""
+    return {name: value for name, value in vars(Selectors).items() if name.isupper() and isinstance(value, str)}
+
+
+def load_cells(path=TEST_DATA_PATH):
+    """(step, language, viewport) for every combination in test_data.json"""
+    data = load_test_data(path)
+    viewports = [viewport for entries in data['viewports'].values() for viewport in entries]
+    return list(itertools.product(range(1, 6), data['languages'], viewports))
+
+
+def time_selector(page, selector, samples):
+    """Median ms to resolve `selector` and describe its matches, plus the matches"""
+    timings = []
+    matches = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        matches = page.locator(selector).evaluate_all(MATCH_JS)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), matches
+
+
+def profile_cell(page, selectors, samples):
+    """{name: (net ms, matches)} for one loaded page
+
+    Net time subtracts the cost of resolving `html`, i.e. the round-trip and
+    serialisation overhead shared by every selector.
+    """
+    overhead, _ = time_selector(page, 'html', samples)
+    results = {}
+    for name, selector in selectors.items():
+        median, matches = time_selector(page, selector, samples)
+        results[name] = (max(0.0, median - overhead), matches)
+    return results
+
+
+def propose_replacement(name, cells):
+    """A data-testid or id selector for what tests act on, or None
+
+    Tests act on `.first`, so the target in each cell is the first visible
+    match; the replacement must name the same element in every cell.
+    """
+    if name in NO_EQUIVALENT:
+        return None
+    targets = []
+    for observation in cells:
+        visible = [m for m in observation['matches'] if m['visible']] or observation['matches']
+        if visible:
+            targets.append(visible[0])
+    testids = {m['testid'] for m in targets}
+    if len(testids) == 1 and None not in testids:
+        return f'[data-testid="{testids.pop()}"]'
+    ids = {(m['tag'], m['id']) for m in targets}
+    if len(ids) == 1 and None not in {m['id'] for m in targets}:
+        tag, element_id = ids.pop()
+        return f'{tag}#{element_id}'
+    return None
+
+
+def run(samples=DEFAULT_SAMPLES, keyword=None):
+    """Profile every selector on every cell; return {name: per-cell observations}"""
+    selectors = selector_constants()
+    state = TestHelpers.load_wizard_state('step5_summary')
+    observations = {name: [] for name in selectors}
+
+    for step, language, viewport in load_cells():
+        cell = f"step{step}/{language}/{viewport['name']}"
+        if keyword and keyword not in cell:
+            continue
+        seed = dict(state, currentStep=step, language=language)
+        size = {'width': viewport['width'], 'height': viewport['height']}
+        with BrowserSession.new_page(seed=seed, viewport=size) as page:
+            page.goto(BASE_URL)
+            TestHelpers.wait_for_navigation(page)
+            for name, (ms, matches) in profile_cell(page, selectors, samples).items():
+                observations[name].append({'cell': cell, 'ms': ms, 'matches': matches})
+    return selectors, observations
+
+
+def verify_replacements(replacements, observations, samples, keyword=None):
+    """Check each proposed replacement on every cell; return {name: (ms, failures)}
+
+    A replacement must match exactly one element wherever the original matched
+    something, and one element on at least one page.
+    """
+    state = TestHelpers.load_wizard_state('step5_summary')
+    matched_cells = {name: {o['cell'] for o in cells if o['matches']} for name, cells in observations.items()}
+    timings = {name: [] for name in replacements}
+    failures = {name: [] for name in replacements}
+    found = set()
+
+    for step, language, viewport in load_cells():
+        cell = f"step{step}/{language}/{viewport['name']}"
+        if keyword and keyword not in cell:
+            continue
+        seed = dict(state, currentStep=step, language=language)
+        size = {'width': viewport['width'], 'height': viewport['height']}
+        with BrowserSession.new_page(seed=seed, viewport=size) as page:
+            page.goto(BASE_URL)
+            TestHelpers.wait_for_navigation(page)
+            results = profile_cell(page, replacements, samples)
+        for name, (ms, matches) in results.items():
+            timings[name].append(ms)
+            if len(matches) == 1:
+                found.add(name)
+            if len(matches) > 1 or (cell in matched_cells[name] and not matches):
+                failures[name].append(f"{cell}: {len(matches)} matches")
+
+    for name in replacements:
+        if name not in found:
+            failures[name].append("matches nothing on any page")
+    return {name: (statistics.median(timings[name]) if timings[name] else 0.0, failures[name])
+            for name in replacements}
+
+
+def analyze(selectors, observations, slow_ms):
+    """Aggregate observations into a per-selector report with flags"""
+    report = {}
+    for name, cells in observations.items():
+        timings = [o['ms'] for o in cells]
+        visible_counts = [sum(m['visible'] for m in o['matches']) for o in cells]
+        flags = []
+        if name not in PLURAL and any(count > 1 for count in visible_counts):
+            flags.append('ambiguous')
+        if timings and statistics.median(timings) > slow_ms:
+            flags.append('slow')
+        if FRAGILE_RE.search(selectors[name]):
+            flags.append('fragile')
+        if not any(o['matches'] for o in cells):
+            flags.append('never-matches')
+        report[name] = {
+            'selector': selectors[name],
+            'median_ms': round(statistics.median(timings), 3) if timings else None,
+            'max_ms': round(max(timings), 3) if timings else None,
+            'max_matches': max((len(o['matches']) for o in cells), default=0),
+            'max_visible': max(visible_counts, default=0),
+            'ambiguous_cells': [o['cell'] for o, count in zip(cells, visible_counts) if count > 1 and name not in PLURAL],
+            'flags': flags,
+            'replacement': propose_replacement(name, cells),
+        }
+        if name in NO_EQUIVALENT:
+            report[name]['no_equivalent'] = NO_EQUIVALENT[name]
+    return report
+
+
+def print_report(report):
+    print(f"{'selector':<26}{'median ms':>10}{'max ms':>9}{'matches':>9}  flags")
+    for name, entry in report.items():
+        median = '-' if entry['median_ms'] is None else f"{entry['median_ms']:.3f}"
+        maximum = '-' if entry['max_ms'] is None else f"{entry['max_ms']:.3f}"
+        print(f"{name:<26}{median:>10}{maximum:>9}{entry['max_visible']:>9}  {', '.join(entry['flags'])}")
+
+    print("\nReplacement map:")
+    for name, entry in report.items():
+        if entry['flags'] and name not in PLURAL:
+            replacement = entry.get('verified_replacement')
+            if 'no_equivalent' in entry:
+                print(f"  ⚠️  {name}: no equivalent element; needs a test change ({entry['no_equivalent']})")
+            elif replacement:
+                print(f"  ✅ {name}: {replacement}  ({entry['replacement_ms']:.3f} ms)")
+            elif entry['replacement']:
+                print(f"  ❌ {name}: {entry['replacement']} rejected: {entry['replacement_failures'][0]}")
+            else:
+                print(f"  ⚠️  {name}: no stable attribute on its matches; add a data-testid")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile Selectors across steps, languages and viewports")
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help="timed resolutions per selector per page")
+    parser.add_argument('--slow-ms', type=float, default=DEFAULT_SLOW_MS,
+                        help=f"flag selectors whose median net cost exceeds this (default: {DEFAULT_SLOW_MS})")
+    parser.add_argument('-k', '--keyword', help="only profile cells whose id (e.g. step2/si/iPad) contains this text")
+    parser.add_argument('--output', help="write the report and replacement map as JSON")
+    args = parser.parse_args(argv)
+
+    selectors, observations = run(args.samples, args.keyword)
+    report = analyze(selectors, observations, args.slow_ms)
+
+    candidates = {name: entry['replacement'] for name, entry in report.items()
+                  if entry['replacement'] and entry['flags'] and name not in PLURAL}
+    for name, (ms, failures) in verify_replacements(candidates, observations, args.samples, args.keyword).items():
+        report[name]['replacement_ms'] = round(ms, 3)
+        report[name]['replacement_failures'] = failures
+        if not failures:
+            report[name]['verified_replacement'] = candidates[name]
+
+    print_report(report)
+
+    if args.output:
+        replacements = {name: entry['verified_replacement'] for name, entry in report.items()
+                        if 'verified_replacement' in entry}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'selectors': report, 'replacements': replacements}, f, indent=4, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n✅ Report written to {args.output}")
+
+    flagged = [name for name, entry in report.items() if set(entry['flags']) & {'ambiguous', 'slow'}]
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Concurrent viewport x language x theme matrix on playwright.async_api
+
+Every cell (each viewport in test_data.json, each language, each theme) gets
+its own BrowserContext in one shared browser, all driven from a single event
+loop. A semaphore bounds how many contexts are open at once, so the matrix
+can grow while wall-clock time grows with cells / concurrency rather than
+with the number of cells.
+
+    python -m tests.responsive_matrix --concurrency 8
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from tests import asset_cache, har_replay
+from tests.selectors import (
+    BASE_URL,
+    FAST_RENDER,
+    NO_MOTION_SCRIPT,
+    SCREENSHOTS,
+    TEST_DATA_PATH,
+    Selectors,
+    TestHelpers,
+    Waits,
+)
+from tests.taxpayer_data import load_test_data
+
+DEFAULT_CONCURRENCY = 6
+MATRIX_SCREENSHOTS_DIR = os.path.join('tests', 'screenshots', 'matrix')
+
+# Tailwind's sm breakpoint; below it the header hides the app title
+SM_BREAKPOINT = 640
+
+# Step indicator prefix per language, proving the seeded language rendered
+STEP_LABELS = {'en': 'Step', 'si': 'පියවර', 'ta': 'படி'}
+
+# WizardProvider's initial data, so seeding only the language leaves Step 1 untouched
+EMPTY_WIZARD_DATA = {'name': '', 'tin': '', 'income': '', 'sources': []}
+
+LAYOUT_JS = """(stepSelector) => {
+    const indicator = [...document.querySelectorAll(stepSelector)]
+        .find((span) => /\\d+\\s*(?:of|\\/)\\s*\\d+/.test(span.textContent));
+    return {
+        stepText: indicator ? indicator.textContent.trim() : null,
+        overflow: document.documentElement.scrollWidth - window.innerWidth,
+    };
+}"""
+
+
+def load_matrix(path=TEST_DATA_PATH):
+    """Return one cell dict per viewport x language x theme in test_data.json"""
+    data = load_test_data(path)
+    viewports = [
+        dict(viewport, category=category)
+        for category, entries in data['viewports'].items()
+        for viewport in entries
+    ]
+    return [
+        {
+            'id': f"{viewport['category']}/{viewport['name']}/{language}/{theme}",
+            'viewport': viewport,
+            'language': language,
+            'theme': theme,
+        }
+        for viewport, language, theme in itertools.product(viewports, data['languages'], data['themes'])
+    ]
+
+
+async def check_layout(page, cell):
+    """Assert the Step 1 layout for one cell; raises AssertionError on failure"""
+    viewport, name = cell['viewport'], cell['viewport']['name']
+
+    assert await page.locator(Selectors.HEADER).first.is_visible(), f"Header should be visible on {name}"
+    assert await page.locator(Selectors.LANGUAGE_TOGGLE).first.is_visible(), \
+        f"Language toggle should be visible on {name}"
+    assert await page.locator(Selectors.THEME_TOGGLE).first.is_visible(), \
+        f"Theme toggle should be visible on {name}"
+    assert await page.locator(Selectors.INPUT_NAME).first.is_visible(), f"Form inputs should be visible on {name}"
+    assert await page.locator("main").first.is_visible(), f"Main content should be visible on {name}"
+    if viewport['width'] >= SM_BREAKPOINT:
+        assert await page.locator(Selectors.APP_TITLE).first.is_visible(), f"App title should be visible on {name}"
+
+    theme = await page.evaluate(Waits.THEME_JS)
+    assert theme == cell['theme'], f"Theme should be {cell['theme']}, got {theme}"
+
+    layout = await page.evaluate(LAYOUT_JS, Selectors.STEP_INDICATOR)
+    label = STEP_LABELS[cell['language']]
+    assert layout['stepText'] and layout['stepText'].startswith(label), \
+        f"Step indicator should read '{label} ...' in {cell['language']}, got {layout['stepText']!r}"
+    assert layout['overflow'] <= 0, f"Page scrolls horizontally by {layout['overflow']}px on {name}"
+
+
+async def run_cell(browser, semaphore, cell, timeout=Waits.DEFAULT_TIMEOUT):
+    """Open a context for `cell`, check it and return its result dict"""
+    viewport = {'width': cell['viewport']['width'], 'height': cell['viewport']['height']}
+    seed = {'currentStep': 1, 'language': cell['language'], 'wizardData': EMPTY_WIZARD_DATA}
+    result = {'id': cell['id'], 'passed': False, 'error': None, 'duration': 0.0, 'screenshot': None}
+
+    async with semaphore:
+        start = time.perf_counter()
+        # With no stored theme, ThemeProvider follows prefers-color-scheme
+        context = await browser.new_context(
+            viewport=viewport,
+            color_scheme=cell['theme'],
+            storage_state=TestHelpers.storage_state_for(seed),
+            reduced_motion='reduce' if FAST_RENDER else 'no-preference',
+        )
+        if FAST_RENDER:
+            await context.add_init_script(script=NO_MOTION_SCRIPT)
+        if asset_cache.ENABLED:
+            await asset_cache.ASSET_CACHE.install_async(context)
+        await har_replay.install_async(context)  # after the cache, so replay answers first
+        page = await context.new_page()
+        try:
+            await page.goto(BASE_URL)
+            await page.wait_for_function(Waits.APP_READY_JS, timeout=timeout)
+            await page.wait_for_function(Waits.ANIMATIONS_IDLE_JS, timeout=timeout)
+            await check_layout(page, cell)
+            result['passed'] = True
+        except (AssertionError, PlaywrightError) as e:
+            # Timeouts, refused connections and closed targets fail this cell, not the matrix
+            result['error'] = str(e).splitlines()[0] if str(e) else type(e).__name__
+            path = os.path.join(MATRIX_SCREENSHOTS_DIR, f"{cell['id'].replace('/', '_').replace(' ', '_').lower()}.png")
+            try:
+                SCREENSHOTS.write(path, await page.screenshot(full_page=True, animations='disabled'))
+                result['screenshot'] = path
+            except PlaywrightError:
+                pass  # the page is gone; keep the original error
+        finally:
+            await context.close()
+            result['duration'] = time.perf_counter() - start
+    return result
+
+
+async def run_matrix(cells, concurrency=DEFAULT_CONCURRENCY):
+    """Run every cell on one browser with at most `concurrency` open contexts"""
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            return await asyncio.gather(*(run_cell(browser, semaphore, cell) for cell in cells))
+        finally:
+            await browser.close()
+
+
+def run_matrix_sync(cells, concurrency=DEFAULT_CONCURRENCY):
+    """Run the matrix from synchronous code
+
+    The event loop runs on its own thread so it never collides with the sync
+    API's loop when BrowserSession is already active in this process.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run_matrix(cells, concurrency)).result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the responsive viewport x language x theme matrix")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"open browser contexts at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('-k', '--keyword', help="only run cells whose id contains this text")
+    args = parser.parse_args(argv)
+
+    cells = [cell for cell in load_matrix() if not args.keyword or args.keyword in cell['id']]
+    start = time.perf_counter()
+    results = asyncio.run(run_matrix(cells, args.concurrency))
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        icon = '✅' if result['passed'] else '❌'
+        line = f"{icon} {result['id']} ({result['duration']:.2f}s)"
+        if result['error']:
+            line += f": {result['error']}"
+        print(line)
+    failed = sum(1 for result in results if not result['passed'])
+    busy = sum(result['duration'] for result in results)
+    print(f"{len(results) - failed}/{len(results)} cells passed in {elapsed:.2f}s "
+          f"(sum of cell time {busy:.2f}s, concurrency {args.concurrency})")
+    SCREENSHOTS.wait()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Parallel Test Runner
+Collects every test_* function across tests/test_*.py and runs them on a pool
+of worker processes, each with its own shared browser
+"""
+
+import argparse
+import importlib
+import inspect
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing.util import Finalize
+
+from tests import app_server, asset_cache, har_replay, smoke, tracer
+from tests.selectors import SCREENSHOTS, BrowserSession
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TESTS_DIR)
+
+
+def collect_tests(keyword=None):
+    """Return (module, function) name pairs for every test, in file order"""
+    collected = []
+    for filename in sorted(os.listdir(TESTS_DIR)):
+        if not (filename.startswith('test_') and filename.endswith('.py')):
+            continue
+        module_name = f"tests.{filename[:-3]}"
+        module = importlib.import_module(module_name)
+        functions = [
+            obj for name, obj in vars(module).items()
+            if name.startswith('test_')
+            and inspect.isfunction(obj)
+            and obj.__module__ == module_name
+        ]
+        functions.sort(key=lambda f: f.__code__.co_firstlineno)
+        for func in functions:
+            test_id = f"{module_name}::{func.__name__}"
+            if keyword and keyword not in test_id:
+                continue
+            collected.append((module_name, func.__name__))
+    return collected
+
+
+def select_shard(tests, shard):
+    """Keep the tests belonging to shard "K/N" (1-based), round-robin by index"""
+    index, total = (int(part) for part in shard.split('/'))
+    if not 1 <= index <= total:
+        raise ValueError(f"Invalid shard {shard}: expected K/N with 1 <= K <= N")
+    return [test for i, test in enumerate(tests) if i % total == index - 1]
+
+
+def _init_worker(trace=False, replay=None):
+    """Per-process setup: run from the project root and clean up on exit"""
+    os.chdir(PROJECT_ROOT)
+    if trace:
+        tracer.install()
+    if replay:
+        har_replay.enable(replay)
+    # Pool workers leave via os._exit, which skips atexit handlers
+    Finalize(None, BrowserSession.close, exitpriority=10)
+    Finalize(None, SCREENSHOTS.close, exitpriority=10)
+
+
+def run_test(module_name, func_name):
+    """Run a single test function, capturing its output and outcome"""
+    output = io.StringIO()
+    status = 'passed'
+    error = None
+    cache_before = asset_cache.ASSET_CACHE.stats()
+    misses_before = len(har_replay.misses)
+    start = time.perf_counter()
+
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            func = getattr(importlib.import_module(module_name), func_name)
+            with tracer.TRACER.span(f"{module_name}::{func_name}", 'test'):
+                func()
+        except SystemExit as e:
+            # Tests report failure by printing and calling sys.exit(1)
+            if e.code not in (None, 0):
+                status = 'failed'
+                error = f"exited with status {e.code}"
+        except AssertionError as e:
+            status = 'failed'
+            error = str(e) or 'assertion failed'
+        except Exception:
+            status = 'error'
+            error = traceback.format_exc()
+
+    return {
+        'id': f"{module_name}::{func_name}",
+        'status': status,
+        'error': error,
+        'duration': time.perf_counter() - start,
+        'output': output.getvalue(),
+        'trace': tracer.TRACER.drain(),
+        'asset_cache': {key: value - cache_before[key] for key, value in asset_cache.ASSET_CACHE.stats().items()
+                        if key in ('hits', 'misses', 'bytes_saved', 'evictions')},
+        'replay_misses': har_replay.misses[misses_before:],
+    }
+
+
+def run_tests(tests, workers, trace=False, replay=None):
+    """Run tests on a process pool and return results in completion order"""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(trace, replay)) as pool:
+        futures = [pool.submit(run_test, module_name, func_name) for module_name, func_name in tests]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            report_result(result)
+    return results
+
+
+def report_result(result):
+    """Print a one-line status for a finished test, plus output on failure"""
+    icon = '✅' if result['status'] == 'passed' else '❌'
+    print(f"{icon} {result['id']} ({result['duration']:.2f}s)")
+    if result['status'] != 'passed':
+        print(result['output'].rstrip())
+        if result['error']:
+            print(f"   {result['status'].upper()}: {result['error'].rstrip()}")
+
+
+def print_summary(results, wall_time):
+    """Print aggregate pass/fail counts and timings"""
+    passed = sum(1 for r in results if r['status'] == 'passed')
+    failed = [r for r in results if r['status'] != 'passed']
+    test_time = sum(r['duration'] for r in results)
+
+    print("\n" + "=" * 60)
+    print(f"{passed} passed, {len(failed)} failed in {wall_time:.2f}s "
+          f"(sum of test time {test_time:.2f}s)")
+    for result in failed:
+        print(f"  ❌ {result['id']}")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the wizard test suite in parallel")
+    parser.add_argument('-n', '--workers', type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('-k', '--keyword', help="only run tests whose id contains this text")
+    parser.add_argument('--shard', help="run only shard K/N of the collected tests, e.g. 2/4")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="record every Playwright/helper action to a Chrome trace-event JSON file")
+    parser.add_argument('--trace-top', type=int, default=15, help="slowest actions to list with --trace")
+    parser.add_argument('--server', choices=['dev', 'prod'],
+                        help="start and pre-warm `next dev` or `next build` + `next start` for the run")
+    parser.add_argument('--no-smoke', action='store_true',
+                        help="schedule browser tests without running the HTTP smoke tier first")
+    parser.add_argument('--replay', nargs='?', const=har_replay.HAR_PATH, metavar='HAR',
+                        help="serve the app from a HAR recording instead of a server (see tests.har_replay)")
+    args = parser.parse_args(argv)
+
+    os.chdir(PROJECT_ROOT)
+    tests = collect_tests(args.keyword)
+    if args.shard:
+        tests = select_shard(tests, args.shard)
+    if not tests:
+        print("No tests collected")
+        return 0
+
+    workers = max(1, min(args.workers, len(tests)))
+    print("=" * 60)
+    print(f"RUNNING {len(tests)} TESTS ON {workers} WORKERS")
+    print("=" * 60)
+
+    if args.replay:
+        # Fail fast on a missing or stale recording, before any worker starts
+        try:
+            har_replay.enable(args.replay)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+
+    try:
+        with app_server.managed_server(args.server):
+            if not args.no_smoke and not args.replay:
+                # Cheap HTTP checks first: a broken server fails in milliseconds, not per test
+                smoke_results, smoke_time = smoke.run_smoke()
+                smoke.print_results(smoke_results, smoke_time)
+                if any(error for _, error in smoke_results):
+                    print("❌ Smoke tier failed; browser tests not scheduled")
+                    return 1
+
+            start = time.perf_counter()
+            results = run_tests(tests, workers, trace=bool(args.trace), replay=args.replay)
+            print_summary(results, time.perf_counter() - start)
+            if asset_cache.ENABLED and results:
+                totals = {key: sum(r['asset_cache'][key] for r in results) for key in results[0]['asset_cache']}
+                print(asset_cache.describe(totals))
+            replay_misses = sorted({url for r in results for url in r['replay_misses']})
+            if replay_misses:
+                # Each one was answered with a 404, so tests may have passed against a partial app
+                print(f"❌ {len(replay_misses)} URLs are not in the HAR recording; "
+                      "run: python -m tests.har_replay record")
+                for url in replay_misses:
+                    print(f"   {url}")
+    except RuntimeError as e:
+        # Port already taken, next failed to start or listen, or pre-warming failed
+        print(f"❌ {e}")
+        return 1
+
+    # Workers have finished writing; drop screenshot objects nothing links to
+    removed, freed = SCREENSHOTS.prune()
+    if removed:
+        print(f"Pruned {removed} unreferenced screenshots ({freed / 1e6:.1f} MB)")
+
+    if args.trace:
+        events = [event for result in results for event in result['trace']]
+        tracer.write_trace(events, args.trace)
+        print()
+        tracer.print_summary(events, args.trace_top)
+        print(f"Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+
+    return 0 if all(r['status'] == 'passed' for r in results) and not replay_misses else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
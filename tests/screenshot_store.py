@@ -0,0 +1,156 @@
+"""
+Asynchronous, content-addressed screenshot store
+
+Screenshots are captured on the test thread (Playwright's sync API is not
+thread-safe) but hashed and written on a background thread pool. Images are
+stored once under `.objects/<sha256>.png`; the requested path is a hard link
+to that object, so identical captures are deduplicated across steps, tests
+and runs and unchanged files are never rewritten.
+
+Policies (SCREENSHOT_POLICY environment variable):
+    always         write every capture (default)
+    on-failure     keep captures in memory; write them only if the test fails
+    baseline-only  write a capture only when no file exists at its path yet
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCREENSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'screenshots')
+POLICIES = ('always', 'on-failure', 'baseline-only')
+PRUNE_MIN_AGE = 60  # s; another process may be about to link a fresh object
+
+
+class ScreenshotStore:
+    """Background, deduplicating writer for page screenshots"""
+
+    def __init__(self, policy='always', root=SCREENSHOTS_DIR, workers=4):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown screenshot policy {policy!r}; expected one of {POLICIES}")
+        self.policy = policy
+        self.objects_dir = os.path.join(root, '.objects')
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot')
+        self._futures = []
+        self._pending = {}  # id(page) -> [(path, png bytes)] for on-failure
+        self._lock = threading.Lock()
+        self.stats = {'captured': 0, 'written': 0, 'deduplicated': 0, 'skipped': 0, 'bytes_written': 0}
+        atexit.register(self.close)
+
+    def capture(self, page, path, full_page=True):
+        """Capture `page` for `path` according to the policy; returns immediately"""
+        if self.policy == 'baseline-only' and os.path.exists(path):
+            with self._lock:
+                self.stats['skipped'] += 1
+            return
+        png = page.screenshot(full_page=full_page, animations='disabled')
+        with self._lock:
+            self.stats['captured'] += 1
+        if self.policy == 'on-failure':
+            self._pending.setdefault(id(page), []).append((path, png))
+        else:
+            self._submit(path, png)
+
+    def write(self, path, png):
+        """Queue PNG bytes captured elsewhere (e.g. by the async API), regardless of policy"""
+        with self._lock:
+            self.stats['captured'] += 1
+        self._submit(path, png)
+
+    def flush(self, page):
+        """Write the captures held back for `page` (on-failure policy)"""
+        for path, png in self._pending.pop(id(page), []):
+            self._submit(path, png)
+
+    def discard(self, page):
+        """Drop the captures held back for `page`"""
+        self._pending.pop(id(page), None)
+
+    def wait(self):
+        """Block until every submitted write has finished; re-raise write errors"""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def prune(self, min_age=PRUNE_MIN_AGE):
+        """Delete objects no named screenshot links to any more; return (count, bytes)
+
+        A named file is a hard link to its object, so an object with a link
+        count of 1 is unreferenced. Where links fall back to copies every
+        object counts as unreferenced, which only costs deduplication.
+        """
+        self.wait()
+        removed, freed = 0, 0
+        cutoff = time.time() - min_age
+        try:
+            entries = list(os.scandir(self.objects_dir))
+        except FileNotFoundError:
+            return removed, freed
+        for entry in entries:
+            if not entry.name.endswith('.png'):
+                continue
+            try:
+                stat = entry.stat()
+                if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+                    continue
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue  # pruned concurrently
+            removed += 1
+            freed += stat.st_size
+        return removed, freed
+
+    def close(self):
+        """Finish outstanding writes and stop the thread pool"""
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, path, png):
+        future = self._executor.submit(self._write, path, png)
+        with self._lock:
+            self._futures.append(future)
+
+    def _write(self, path, png):
+        """Store `png` by content hash and point `path` at it"""
+        digest = hashlib.sha256(png).hexdigest()
+        obj = os.path.join(self.objects_dir, f"{digest}.png")
+
+        if os.path.exists(obj):
+            with self._lock:
+                self.stats['deduplicated'] += 1
+        else:
+            _atomic_write(obj, png)
+            with self._lock:
+                self.stats['written'] += 1
+                self.stats['bytes_written'] += len(png)
+
+        if os.path.exists(path) and os.path.samefile(path, obj):
+            return
+        _atomic_link(obj, path)
+
+
+def _atomic_write(path, data):
+    """Write via a temp file + rename so concurrent processes never see partial files"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _atomic_link(source, path):
+    """Point `path` at `source` with a hard link, falling back to a copy"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, tmp)
+    except OSError:  # e.g. filesystems without hard links
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, path)
@@ -2,6 +2,56 @@
 Centralized selectors and helper functions for Sri Lanka Tax Wizard tests
 """
 
+import atexit
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright
+
+from tests import asset_cache, browser_server
+from tests.screenshot_store import ScreenshotStore
+from tests.taxpayer_data import TEST_DATA_PATH, load_test_data
+
+BASE_URL = os.environ.get('BASE_URL', 'http://localhost:3000')
+
+# localStorage keys written by WizardProvider and ThemeProvider
+WIZARD_STORAGE_KEY = 'tax-wizard-data'
+THEME_STORAGE_KEY = 'tax-wizard-theme'
+
+SCREENSHOTS = ScreenshotStore(policy=os.environ.get('SCREENSHOT_POLICY', 'always'))
+
+# Fast-render mode: every BrowserSession context prefers reduced motion and
+# runs with CSS animations and transitions collapsed to zero length, so the
+# page wrapper's colour transition and the steps' slide-in finish on the
+# frame they start. FAST_RENDER=off keeps the app's real motion.
+FAST_RENDER = os.environ.get('FAST_RENDER') != 'off'
+
+NO_MOTION_CSS = """
+*, *::before, *::after {
+    animation-duration: 0s !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    transition-duration: 0s !important;
+    transition-delay: 0s !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+# Init script adopting NO_MOTION_CSS. A constructed stylesheet needs no <style>
+# node, so it is in place before the first paint and does not disturb React
+# hydration of <head>
+NO_MOTION_SCRIPT = f"""(() => {{
+    const sheet = new CSSStyleSheet();
+    sheet.replaceSync({json.dumps(NO_MOTION_CSS)});
+    document.adoptedStyleSheets = [...document.adoptedStyleSheets, sheet];
+}})();"""
+
+
 class Selectors:
     """CSS selectors for common elements"""
     
@@ -35,35 +85,92 @@ class Selectors:
     FOOTER = "footer"
 
 
+@dataclass
+class WizardSnapshot:
+    """The wizard's visible and stored state, read in a single round-trip"""
+
+    step: Optional[int]
+    total_steps: Optional[int]
+    language: Optional[str]
+    theme: str
+    fields: Dict[str, str] = field(default_factory=dict)  # input/select/textarea value by id (or name)
+    checkboxes: Dict[str, bool] = field(default_factory=dict)  # checked state by id (or name)
+    errors: List[str] = field(default_factory=list)  # text of visible error messages
+    stored: Optional[dict] = None  # parsed tax-wizard-data, or None if missing/invalid
+
+    @property
+    def wizard_data(self):
+        """The persisted form data (`stored['wizardData']`), or {}"""
+        return (self.stored or {}).get('wizardData') or {}
+
+
 class TestHelpers:
     """Helper functions for common test operations"""
     
+    SNAPSHOT_JS = """([stepSelector, errorSelector, storageKey]) => {
+        const root = document.documentElement;
+        const visible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+
+        let step = null, totalSteps = null;
+        for (const span of document.querySelectorAll(stepSelector)) {
+            const match = span.textContent.match(/(\\d+)\\s*(?:of|\\/)\\s*(\\d+)/);
+            if (match) {
+                step = parseInt(match[1], 10);
+                totalSteps = parseInt(match[2], 10);
+                break;
+            }
+        }
+
+        const fields = {}, checkboxes = {};
+        for (const el of document.querySelectorAll('input, select, textarea')) {
+            const key = el.id || el.name;
+            if (!key) continue;
+            if (el.type === 'checkbox' || el.type === 'radio') checkboxes[key] = el.checked;
+            else fields[key] = el.value;
+        }
+
+        let stored = null;
+        try {
+            stored = JSON.parse(localStorage.getItem(storageKey));
+        } catch (e) {}
+
+        return {
+            step,
+            total_steps: totalSteps,
+            language: stored && stored.language ? stored.language : null,
+            theme: root.getAttribute('data-theme') || (root.classList.contains('dark') ? 'dark' : 'light'),
+            fields,
+            checkboxes,
+            errors: [...document.querySelectorAll(errorSelector)].filter(visible).map((el) => el.textContent.trim()),
+            stored,
+        };
+    }"""
+    
     @staticmethod
     def wait_for_navigation(page):
-        """Wait for page to be fully loaded"""
-        page.wait_for_load_state('networkidle')
-        page.wait_for_timeout(500)  # Additional stabilization time
+        """Wait for page to be loaded and the app hydrated"""
+        page.wait_for_load_state('load')
+        Waits.for_app_ready(page)
     
     @staticmethod
     def take_screenshot(page, path):
-        """Take a full-page screenshot"""
-        page.screenshot(path=path, full_page=True)
+        """Take a full-page screenshot; hashing and writing happen in the background
+
+        Waits for running animations to finish first. Screenshots are also
+        taken on failure paths, so a timeout here only warns.
+        """
+        try:
+            Waits.for_animations_idle(page)
+        except AssertionError as e:
+            print(f"⚠️  {e}: {', '.join(Waits.running_animations(page))}")
+        SCREENSHOTS.capture(page, path, full_page=True)
     
     @staticmethod
     def get_current_step(page):
         """Extract current step number from step indicator"""
         try:
-            # Get all spans that match the step indicator pattern
-            indicators = page.locator(Selectors.STEP_INDICATOR).all()
-            for indicator in indicators:
-                text = indicator.text_content()
-                if 'Step' in text or 'පියවර' in text or 'படி' in text:
-                    # Extract first number from "Step X of Y" format
-                    import re
-                    match = re.search(r'\d+', text)
-                    if match:
-                        return int(match.group())
-            return None
+            # Parse "Step X of Y" / "X / Y" in the page: one round-trip for all spans
+            return page.evaluate(Waits.STEP_JS, Selectors.STEP_INDICATOR)
         except Exception as e:
             print(f"Error getting current step: {e}")
             return None
@@ -86,7 +193,249 @@ class TestHelpers:
         """Get item from localStorage"""
         return page.evaluate(f"() => localStorage.getItem('{key}')")
     
+    @staticmethod
+    def load_wizard_state(name):
+        """Load a named wizard state fixture from test_data.json"""
+        return load_test_data()['wizard_states'][name]
+    
+    @staticmethod
+    def storage_state_for(state):
+        """Build a Playwright storage_state that seeds WizardProvider with `state`
+
+        `state` holds `currentStep`, `wizardData` and `language`, the same
+        shape WizardProvider saves under the tax-wizard-data key.
+        """
+        return {
+            'cookies': [],
+            'origins': [{
+                'origin': BASE_URL,
+                'localStorage': [{'name': WIZARD_STORAGE_KEY, 'value': json.dumps(state)}],
+            }],
+        }
+    
     @staticmethod
     def get_theme(page):
-        """Get current theme from document class"""
-        return page.evaluate("() => document.documentElement.classList.contains('dark') ? 'dark' : 'light'")
+        """Get current theme from the document element"""
+        return page.evaluate(Waits.THEME_JS)
+    
+    @classmethod
+    def snapshot(cls, page):
+        """Read step, language, theme, fields, checkboxes, errors and stored state at once"""
+        return WizardSnapshot(**page.evaluate(cls.SNAPSHOT_JS, [
+            Selectors.STEP_INDICATOR, Selectors.ERROR_MESSAGE, WIZARD_STORAGE_KEY,
+        ]))
+
+
+class Waits:
+    """Condition-based waits on real app signals.
+
+    Each wait polls in the browser via `wait_for_function`, raises
+    AssertionError on timeout (so tests report it like any failed check) and
+    records how long it actually took in `Waits.timings`.
+    """
+
+    DEFAULT_TIMEOUT = 5000  # ms
+    FAST_RENDER_IDLE_TIMEOUT = 500  # ms; nothing should be animating at all
+    timings = []
+
+    # ThemeProvider sets data-theme on <html>; the dark class is kept as a fallback
+    THEME_JS = """() => {
+        const root = document.documentElement;
+        return root.getAttribute('data-theme') || (root.classList.contains('dark') ? 'dark' : 'light');
+    }"""
+
+    STEP_JS = """(selector) => {
+        for (const span of document.querySelectorAll(selector)) {
+            const match = span.textContent.match(/(\\d+)\\s*(?:of|\\/)\\s*\\d+/);
+            if (match) return parseInt(match[1], 10);
+        }
+        return null;
+    }"""
+
+    @classmethod
+    def _wait(cls, page, name, expression, arg=None, timeout=None):
+        """Wait until `expression` is truthy in the page, recording the duration"""
+        timeout = cls.DEFAULT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            page.wait_for_function(expression, arg=arg, timeout=timeout)
+        except PlaywrightTimeoutError:
+            raise AssertionError(f"Timed out after {timeout}ms waiting for {name}") from None
+        finally:
+            cls.timings.append((name, time.perf_counter() - start))
+        return cls.timings[-1][1]
+
+    # Hydrated (ThemeProvider has applied data-theme) and fonts loaded
+    APP_READY_JS = """() =>
+        document.documentElement.hasAttribute('data-theme') && document.fonts.status === 'loaded'
+    """
+
+    @classmethod
+    def for_app_ready(cls, page, timeout=None):
+        """Wait for hydration (ThemeProvider has applied data-theme) and fonts"""
+        return cls._wait(page, 'app ready', cls.APP_READY_JS, timeout=timeout)
+
+    @classmethod
+    def for_step(cls, page, step, timeout=None):
+        """Wait until the step indicator shows `step`"""
+        return cls._wait(page, f'step {step}', f"""(selector) => ({cls.STEP_JS})(selector) === {int(step)}""",
+                         arg=Selectors.STEP_INDICATOR, timeout=timeout)
+
+    @classmethod
+    def for_validation(cls, page, from_step, timeout=None):
+        """Wait until a submit on `from_step` settles: an error shows or the step changes"""
+        return cls._wait(page, f'validation on step {from_step}', f"""([stepSelector, errorSelector]) =>
+            document.querySelector(errorSelector) !== null || ({cls.STEP_JS})(stepSelector) !== {int(from_step)}
+        """, arg=[Selectors.STEP_INDICATOR, Selectors.ERROR_MESSAGE], timeout=timeout)
+
+    @classmethod
+    def for_storage_change(cls, page, key, previous, timeout=None):
+        """Wait until localStorage[key] differs from `previous`"""
+        return cls._wait(page, f'localStorage {key} update',
+                         "([key, previous]) => localStorage.getItem(key) !== previous",
+                         arg=[key, previous], timeout=timeout)
+
+    @classmethod
+    def for_language(cls, page, language, timeout=None):
+        """Wait until WizardProvider has persisted `language` to localStorage"""
+        return cls._wait(page, f'language {language}', """([key, language]) => {
+            try {
+                return JSON.parse(localStorage.getItem(key)).language === language;
+            } catch (e) {
+                return false;
+            }
+        }""", arg=[WIZARD_STORAGE_KEY, language], timeout=timeout)
+
+    @classmethod
+    def for_theme(cls, page, theme, timeout=None):
+        """Wait until the document theme is `theme`"""
+        return cls._wait(page, f'theme {theme}', f"""(theme) => ({cls.THEME_JS})() === theme""",
+                         arg=theme, timeout=timeout)
+
+    @classmethod
+    def for_theme_change(cls, page, previous, timeout=None):
+        """Wait until the document theme flips away from `previous`"""
+        return cls._wait(page, 'theme change', f"""(previous) => ({cls.THEME_JS})() !== previous""",
+                         arg=previous, timeout=timeout)
+
+    ANIMATIONS_IDLE_JS = """() =>
+        document.getAnimations().every((animation) => animation.playState !== 'running')
+    """
+
+    @classmethod
+    def for_animations_idle(cls, page, timeout=None):
+        """Wait until no CSS animation or transition is running
+
+        On a fast-render page nothing should be left to wait for, so a short
+        timeout applies and a timeout means the override did not take effect.
+        """
+        if timeout is None and id(page) in BrowserSession.fast_render_pages:
+            timeout = cls.FAST_RENDER_IDLE_TIMEOUT
+        return cls._wait(page, 'animations idle', cls.ANIMATIONS_IDLE_JS, timeout=timeout)
+
+    # "<animation name or transitioned property> on <element>" for each running animation
+    RUNNING_ANIMATIONS_JS = """() => document.getAnimations()
+        .filter((animation) => animation.playState === 'running')
+        .map((animation) => {
+            const target = animation.effect && animation.effect.target;
+            const element = target ? target.tagName.toLowerCase()
+                + (target.classList.length ? '.' + [...target.classList].join('.') : '') : '?';
+            return `${animation.animationName || animation.transitionProperty || 'animation'} on ${element}`;
+        })"""
+
+    @classmethod
+    def running_animations(cls, page):
+        """Describe the animations and transitions running right now"""
+        return page.evaluate(cls.RUNNING_ANIMATIONS_JS)
+
+    @classmethod
+    def summary(cls):
+        """Return {wait name: (count, total seconds, max seconds)} for recorded waits"""
+        stats = {}
+        for name, seconds in cls.timings:
+            count, total, longest = stats.get(name, (0, 0.0, 0.0))
+            stats[name] = (count + 1, total + seconds, max(longest, seconds))
+        return stats
+
+
+class BrowserSession:
+    """Process-wide Chromium shared by every test in a run.
+
+    The browser is obtained lazily on first use and closed at interpreter
+    exit: a warm one from `python -m tests.browser_server start` when that is
+    running, otherwise a local launch. Each test gets its own BrowserContext,
+    so cookies and localStorage start empty without a clear-and-reload
+    round-trip.
+    """
+
+    _playwright = None
+    _browser = None
+    # Callables applied to every new context before its page opens (routing, init scripts)
+    context_hooks = []
+    fast_render_pages = set()  # id() of open pages with motion collapsed
+
+    @classmethod
+    def browser(cls):
+        """Return the shared browser, launching it on first call"""
+        if cls._browser is None:
+            if cls._playwright is None:
+                cls._playwright = sync_playwright().start()
+                atexit.register(cls.close)
+            cls._browser = (browser_server.connect(cls._playwright)
+                            or cls._playwright.chromium.launch(headless=True))
+        return cls._browser
+
+    @classmethod
+    @contextmanager
+    def new_page(cls, seed=None, cache_assets=None, fast_render=None, **context_options):
+        """Yield a page in a fresh, isolated BrowserContext
+
+        Keyword arguments are passed to `Browser.new_context`, e.g.
+        `viewport={'width': 375, 'height': 667}`. A `seed` wizard state (see
+        `TestHelpers.load_wizard_state`) is written to localStorage before any
+        page script runs, so the app opens directly on the seeded step.
+
+        `fast_render` (default: on unless FAST_RENDER=off) defaults the
+        context to `reduced_motion='reduce'` and collapses animations and
+        transitions. Static assets come from the shared asset cache unless
+        `cache_assets` is False (default: on unless ASSET_CACHE=off).
+        """
+        if seed is not None:
+            context_options['storage_state'] = TestHelpers.storage_state_for(seed)
+        fast_render = FAST_RENDER if fast_render is None else fast_render
+        if fast_render:
+            context_options.setdefault('reduced_motion', 'reduce')
+        context = cls.browser().new_context(**context_options)
+        if fast_render:
+            context.add_init_script(script=NO_MOTION_SCRIPT)
+        if asset_cache.ENABLED if cache_assets is None else cache_assets:
+            asset_cache.ASSET_CACHE.install(context)  # before the hooks, so replay routes answer first
+        for hook in cls.context_hooks:
+            hook(context)
+        page = context.new_page()
+        if fast_render:
+            cls.fast_render_pages.add(id(page))
+        failed = False
+        try:
+            yield page
+        except BaseException as e:
+            failed = not (isinstance(e, SystemExit) and e.code in (None, 0))
+            raise
+        finally:
+            # Screenshots held back by the on-failure policy are kept only if the test failed
+            if failed:
+                SCREENSHOTS.flush(page)
+            else:
+                SCREENSHOTS.discard(page)
+            cls.fast_render_pages.discard(id(page))
+            context.close()
+
+    @classmethod
+    def close(cls):
+        """Close (or disconnect from) the shared browser and stop Playwright"""
+        if cls._browser is not None:
+            cls._browser.close()
+            cls._browser = None
+        if cls._playwright is not None:
+            cls._playwright.stop()
+            cls._playwright = None
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+HTTP-only smoke tier
+
+Fetches `/` over a keep-alive HTTP connection and checks the server-rendered
+HTML from app/layout.js and app/page.js: document language and title, the
+header with its title and toggles, the step indicator on Step 1, the Step 1
+inputs, the Next button, the footer and the /_next/ assets the page needs. No
+browser is launched, so the whole tier takes milliseconds against a warm
+server.
+
+The runner executes this tier first and only schedules the browser tests when
+it passes (`python -m tests.runner --no-smoke` skips it).
+
+    python -m tests.smoke
+"""
+
+import http.client
+import re
+import sys
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+from tests.selectors import BASE_URL
+
+REQUEST_TIMEOUT = 30  # s; a dev server may still compile `/`
+STEP_TEXT_RE = re.compile(r'(\d+)\s*(?:of|/)\s*(\d+)')
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+RAW_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+class HTTPClient:
+    """Keep-alive connections to one server, reused across requests and threads"""
+
+    def __init__(self, base_url=BASE_URL):
+        parsed = urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self, path='/'):
+        """GET `path`; return (status, headers dict, body bytes)
+
+        A pooled connection the server has meanwhile closed is replaced once.
+        """
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        reused = connection is not None
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+        try:
+            response = self._request(connection, path)
+        except (http.client.HTTPException, ConnectionError):
+            connection.close()
+            if not reused:
+                raise
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            response = self._request(connection, path)
+        status, headers, body, will_close = response
+        if will_close:
+            connection.close()
+        else:
+            with self._lock:
+                self._idle.append(connection)
+        return status, headers, body
+
+    def close(self):
+        with self._lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
+
+    @staticmethod
+    def _request(connection, path):
+        connection.request('GET', path, headers={'Accept': 'text/html'})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, {k.lower(): v for k, v in response.getheaders()}, body, response.will_close
+
+
+CLIENT = HTTPClient()
+
+
+class Element:
+    """A parsed HTML element: tag, attributes and child elements/strings"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+
+    def text(self):
+        """Concatenated, whitespace-collapsed text content"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return ' '.join(''.join(parts).split())
+
+    def iter(self):
+        """Every descendant element, in document order"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                yield node
+                stack.extend(reversed(node.children))
+
+    def find_all(self, tag=None, id=None, testid=None):
+        return [el for el in self.iter()
+                if (tag is None or el.tag == tag)
+                and (id is None or el.attrs.get('id') == id)
+                and (testid is None or el.attrs.get('data-testid') == testid)]
+
+    def find(self, tag=None, id=None, testid=None):
+        matches = self.find_all(tag, id, testid)
+        return matches[0] if matches else None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        # <path/> in inline SVG icons and the like never get an end tag
+        self.current.children.append(Element(tag, {name: value or '' for name, value in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self.current.tag not in RAW_TEXT_TAGS:
+            self.current.children.append(data)
+
+
+def parse_html(html):
+    """Parse `html` into an Element tree rooted at '#document'"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _check_document(doc):
+    html = doc.find('html')
+    assert html is not None, "No <html> element"
+    assert html.attrs.get('lang') == 'en', f"<html lang> should be 'en', got {html.attrs.get('lang')!r}"
+    title = doc.find('title')
+    assert title is not None and title.text() == 'Sri Lanka Tax Wizard', \
+        f"<title> should be 'Sri Lanka Tax Wizard', got {title.text() if title else None!r}"
+
+
+def _check_header(doc):
+    header = doc.find('header')
+    assert header is not None, "No <header>"
+    title = header.find(testid='app-title')
+    assert title is not None and title.text() == 'Tax Wizard', "Header should show the 'Tax Wizard' title"
+    language = header.find(tag='button', testid='language-toggle')
+    assert language is not None and language.text() == 'EN', "Header should have the language toggle showing EN"
+    assert header.find(tag='button', testid='theme-toggle') is not None, "Header should have the theme toggle"
+
+
+def _check_step_indicator(doc):
+    indicator = doc.find(testid='step-indicator')
+    assert indicator is not None, "No step indicator"
+    match = STEP_TEXT_RE.search(indicator.text())
+    assert match and match.groups() == ('1', '5'), f"Step indicator should read 'Step 1 of 5', got {indicator.text()!r}"
+
+
+def _check_step1_inputs(doc):
+    for field in ('name', 'tin', 'income'):
+        element = doc.find(id=field)
+        assert element is not None and element.tag == 'input', f"Step 1 should render input#{field}"
+        label = [el for el in doc.find_all('label') if el.attrs.get('for') == field]
+        assert label and label[0].text(), f"input#{field} should have a label"
+    assert doc.find(tag='button', testid='nav-next') is not None, "Step 1 should render the Next button"
+
+
+def _check_footer(doc):
+    footer = doc.find('footer')
+    assert footer is not None, "No <footer>"
+    assert 'Sri Lanka Tax Wizard' in footer.text(), f"Footer text unexpected: {footer.text()!r}"
+
+
+def _check_assets(doc):
+    scripts = [el for el in doc.find_all('script') if el.attrs.get('src', '').startswith('/_next/')]
+    styles = [el for el in doc.find_all('link')
+              if el.attrs.get('rel') == 'stylesheet' and el.attrs.get('href', '').startswith('/_next/')]
+    assert scripts, "No /_next/ scripts referenced"
+    assert styles, "No /_next/ stylesheet referenced"
+
+
+CHECKS = [
+    ('document', _check_document),
+    ('header', _check_header),
+    ('step indicator', _check_step_indicator),
+    ('step 1 inputs', _check_step1_inputs),
+    ('footer', _check_footer),
+    ('assets', _check_assets),
+]
+
+
+def run_smoke(client=CLIENT):
+    """Fetch `/` and run every check; return (results, elapsed seconds)
+
+    Each result is (name, error or None). A failed fetch is a single result.
+    """
+    start = time.perf_counter()
+    try:
+        status, headers, body = client.get('/')
+    except OSError as e:
+        return [('GET /', f"{BASE_URL} unreachable: {e}")], time.perf_counter() - start
+    if status != 200 or not headers.get('content-type', '').startswith('text/html'):
+        return [('GET /', f"status {status}, content-type {headers.get('content-type')!r}")], \
+            time.perf_counter() - start
+
+    doc = parse_html(body.decode('utf-8', 'replace'))
+    results = []
+    for name, check in CHECKS:
+        try:
+            check(doc)
+            results.append((name, None))
+        except AssertionError as e:
+            results.append((name, str(e)))
+    return results, time.perf_counter() - start
+
+
+def print_results(results, elapsed):
+    for name, error in results:
+        print(f"  ✅ {name}" if error is None else f"  ❌ {name}: {error}")
+    failed = sum(1 for _, error in results if error)
+    print(f"Smoke tier: {len(results) - failed}/{len(results)} checks passed in {elapsed * 1000:.0f} ms")
+
+
+def main():
+    print("🧪 Smoke-testing server-rendered HTML...")
+    results, elapsed = run_smoke()
+    print_results(results, elapsed)
+    return 1 if any(error for _, error in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Push-based observer for wizard state transitions
+
+`StateObserver.attach(page)` exposes a binding and installs an init script
+that wraps `localStorage.setItem` (WizardProvider persists tax-wizard-data,
+ThemeProvider tax-wizard-theme) and watches the `data-theme` attribute and
+`class` of <html> (ThemeProvider applies the theme there). Every transition
+is pushed to Python as it happens and appended to a timestamped event list.
+
+Waiting does not poll: `wait_for` blocks inside a single `evaluate` that the
+page resolves when its next event has been delivered, then re-checks the
+events received meanwhile.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from playwright.sync_api import Error as PlaywrightError
+
+from tests.selectors import WIZARD_STORAGE_KEY, Waits
+
+BINDING_NAME = '__pushStateEvent'
+
+# Runs before any page script, so the hooks see the app's very first writes
+HOOK_JS = """(() => {
+    const push = window[%(binding)s];
+    // doc tells documents apart across reloads, where seq starts over
+    const state = window.__stateObserver = { doc: Math.random().toString(36).slice(2), seq: 0, waiters: [] };
+    const wake = () => state.waiters.splice(0).forEach((resolve) => resolve());
+    const emit = (event) => {
+        event.seq = ++state.seq;
+        event.doc = state.doc;
+        event.time = performance.timeOrigin + performance.now();
+        push(event).then(wake, wake);
+    };
+
+    const setItem = Storage.prototype.setItem;
+    Storage.prototype.setItem = function (key, value) {
+        const previous = this.getItem(key);
+        setItem.call(this, key, value);
+        if (this === window.localStorage) emit({ kind: 'storage', key, value: String(value), previous });
+    };
+
+    const theme = %(theme_js)s;
+    let lastTheme = null;
+    const watchTheme = () => {
+        const observer = new MutationObserver(() => {
+            const current = theme();
+            if (current !== lastTheme) {
+                emit({ kind: 'theme', key: 'theme', value: current, previous: lastTheme });
+                lastTheme = current;
+            }
+        });
+        observer.observe(document.documentElement, { attributes: true, attributeFilter: ['data-theme', 'class'] });
+    };
+    if (document.documentElement) watchTheme();
+    else document.addEventListener('readystatechange', watchTheme, { once: true });
+})();"""
+
+# Resolves on the page's next delivered event, immediately if one arrived after
+# the last event Python has seen, or after `timeout` ms
+NEXT_EVENT_JS = """([doc, seen, timeout]) => new Promise((resolve) => {
+    const state = window.__stateObserver;
+    // No hooks yet (e.g. about:blank before the first goto): back off briefly
+    if (!state) return setTimeout(resolve, Math.min(timeout, 50));
+    if (state.seq > (state.doc === doc ? seen : 0)) return resolve();
+    state.waiters.push(resolve);
+    setTimeout(resolve, timeout);
+})"""
+
+
+@dataclass
+class StateEvent:
+    """One state transition pushed from the page"""
+
+    kind: str  # 'storage' or 'theme'
+    key: str  # localStorage key, or 'theme'
+    value: Any  # new value; tax-wizard-data is parsed into a dict
+    previous: Any
+    time: float  # page clock, ms since the epoch
+    received: float  # Python time.time() * 1000 when the binding fired
+    seq: int
+    doc: str
+
+
+class StateObserver:
+    """Collects state transitions pushed from a page and waits on them"""
+
+    def __init__(self, page):
+        self.page = page
+        self.events = []
+
+    @classmethod
+    def attach(cls, page):
+        """Install the binding and hooks on `page`; call before `page.goto`"""
+        observer = cls(page)
+        page.expose_binding(BINDING_NAME, observer._receive)
+        page.add_init_script(HOOK_JS % {
+            'binding': json.dumps(BINDING_NAME),
+            'theme_js': Waits.THEME_JS,
+        })
+        return observer
+
+    def _receive(self, source, event):
+        value, previous = event['value'], event['previous']
+        if event['key'] == WIZARD_STORAGE_KEY:
+            value, previous = _parse(value), _parse(previous)
+        self.events.append(StateEvent(
+            kind=event['kind'],
+            key=event['key'],
+            value=value,
+            previous=previous,
+            time=event['time'],
+            received=time.time() * 1000,
+            seq=event['seq'],
+            doc=event['doc'],
+        ))
+
+    def wait_for(self, predicate, description='state change', timeout=None, since=0):
+        """Return the first event at index >= `since` matching `predicate`
+
+        Raises AssertionError on timeout, like the Waits helpers.
+        """
+        timeout = Waits.DEFAULT_TIMEOUT if timeout is None else timeout
+        deadline = time.perf_counter() + timeout / 1000
+        checked = since
+        while True:
+            for event in self.events[checked:]:
+                if predicate(event):
+                    return event
+            checked = max(checked, len(self.events))
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise AssertionError(f"Timed out after {timeout}ms waiting for {description}")
+            last = self.events[-1] if self.events else None
+            try:
+                # Blocks in the page; bindings are dispatched to _receive meanwhile
+                self.page.evaluate(NEXT_EVENT_JS, [
+                    last.doc if last else None, last.seq if last else 0, int(remaining * 1000) + 1,
+                ])
+            except PlaywrightError:
+                pass  # navigation destroyed the context; the new document pushes its own events
+
+    def mark(self):
+        """Index to pass as `since` so a wait only matches events after this point"""
+        return len(self.events)
+
+    def wait_for_step(self, step, timeout=None, since=0):
+        """Wait until WizardProvider persists currentStep == `step`"""
+        return self.wait_for(
+            lambda e: e.key == WIZARD_STORAGE_KEY and (e.value or {}).get('currentStep') == step,
+            f'step {step}', timeout, since)
+
+    def wait_for_language(self, language, timeout=None, since=0):
+        """Wait until WizardProvider persists `language`"""
+        return self.wait_for(
+            lambda e: e.key == WIZARD_STORAGE_KEY and (e.value or {}).get('language') == language,
+            f'language {language}', timeout, since)
+
+    def wait_for_theme(self, theme, timeout=None, since=0):
+        """Wait until <html> switches to `theme`"""
+        return self.wait_for(lambda e: e.kind == 'theme' and e.value == theme, f'theme {theme}', timeout, since)
+
+    def wait_for_storage(self, key, value=None, timeout=None, since=0):
+        """Wait for a write to localStorage[key] (with `value`, if given)"""
+        return self.wait_for(lambda e: e.key == key and (value is None or e.value == value),
+                             f'localStorage {key} write', timeout, since)
+
+    def timeline(self):
+        """[(ms since first event, kind, key, value)] in page-clock order"""
+        if not self.events:
+            return []
+        ordered = sorted(self.events, key=lambda e: e.time)
+        start = ordered[0].time
+        return [(event.time - start, event.kind, event.key, event.value) for event in ordered]
+
+    def delivery_latencies(self):
+        """ms from each page-side event to its arrival in Python"""
+        return [event.received - event.time for event in self.events]
+
+
+def _parse(value):
+    try:
+        return json.loads(value) if value is not None else None
+    except ValueError:
+        return value
+
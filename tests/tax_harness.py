@@ -0,0 +1,134 @@
+"""
+Batched in-browser evaluation of utils/taxCalculator.js
+
+Loads the real calculator module into a blank page and evaluates
+`calculateTax` for a whole batch of incomes in a single `page.evaluate`
+round-trip. Incomes go in and results come back as packed little-endian
+Float64 arrays (base64), so hundreds of thousands of cases cost one call.
+Results are checked against tests/tax_oracle.py.
+"""
+
+import base64
+import math
+import os
+import sys
+from array import array
+
+from tests import tax_oracle
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAX_CALCULATOR_PATH = os.path.join(PROJECT_ROOT, 'utils', 'taxCalculator.js')
+
+# Fields returned by calculateTax, in packed-array order
+RESULT_FIELDS = ('taxableIncome', 'totalTax', 'monthlyTax', 'effectiveRate')
+
+LOAD_MODULE_JS = """async ([source, globalName]) => {
+    const url = URL.createObjectURL(new Blob([source], { type: 'text/javascript' }));
+    try {
+        window[globalName] = await import(url);
+    } finally {
+        URL.revokeObjectURL(url);
+    }
+}"""
+
+EVALUATE_BATCH_JS = """([packedIncomes, fields]) => {
+    const decode = (b64) => {
+        const bytes = Uint8Array.from(atob(b64), (c) => c.charCodeAt(0));
+        return new Float64Array(bytes.buffer);
+    };
+    const encode = (values) => {
+        const bytes = new Uint8Array(values.buffer);
+        let binary = '';
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    };
+
+    const { calculateTax } = window.__taxCalculator;
+    const incomes = decode(packedIncomes);
+    const columns = fields.map(() => new Float64Array(incomes.length));
+
+    for (let i = 0; i < incomes.length; i++) {
+        const result = calculateTax(incomes[i]);
+        for (let f = 0; f < fields.length; f++) {
+            // calculateTax returns a bare 0 for empty or NaN income
+            columns[f][i] = typeof result === 'object' ? result[fields[f]] : 0;
+        }
+    }
+    return columns.map(encode);
+}"""
+
+
+def _pack(values):
+    """Pack floats as base64 little-endian Float64"""
+    packed = array('d', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+def _unpack(encoded):
+    """Inverse of `_pack`"""
+    values = array('d')
+    values.frombytes(base64.b64decode(encoded))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def load_js_module(page, path, global_name):
+    """Import a self-contained ES module from `path` into `page` as window[global_name]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    page.evaluate(LOAD_MODULE_JS, [source, global_name])
+
+
+def load_tax_calculator(page):
+    """Import utils/taxCalculator.js into `page` as window.__taxCalculator"""
+    load_js_module(page, TAX_CALCULATOR_PATH, '__taxCalculator')
+
+
+def evaluate_tax_batch(page, incomes):
+    """Evaluate calculateTax for every income in one round-trip
+
+    Returns {field: array('d')} for each name in RESULT_FIELDS.
+    `load_tax_calculator` must have been called on the page first.
+    """
+    columns = page.evaluate(EVALUATE_BATCH_JS, [_pack(incomes), list(RESULT_FIELDS)])
+    return {field: _unpack(column) for field, column in zip(RESULT_FIELDS, columns)}
+
+
+def bracket_boundary_incomes(step=25, upper=10000000, radius=3):
+    """Income grid: a regular sweep plus every value within `radius` of a slab edge"""
+    incomes = set(range(0, upper + 1, step))
+    for edge in tax_oracle.slab_edges():
+        for offset in range(-radius, radius + 1):
+            incomes.add(edge + offset)
+            incomes.add(edge + offset + 0.5)
+    return sorted(income for income in incomes if income >= 0)
+
+
+def compare_with_reference(incomes, results, rel_tol=1e-9, abs_tol=1e-6):
+    """Return (income, field, browser value, oracle value) for every mismatch
+
+    Uses the vectorized oracle when NumPy is installed, else checks per income.
+    """
+    if tax_oracle.np is not None:
+        np = tax_oracle.np
+        expected = tax_oracle.calculate_array(incomes)
+        mismatches = []
+        for field in RESULT_FIELDS:
+            got = np.frombuffer(results[field], dtype=np.float64)
+            bad = ~np.isclose(got, expected[field], rtol=rel_tol, atol=abs_tol)
+            for i in np.flatnonzero(bad):
+                mismatches.append((incomes[i], field, float(got[i]), float(expected[field][i])))
+        return mismatches
+
+    mismatches = []
+    for i, income in enumerate(incomes):
+        for field, want in zip(RESULT_FIELDS, tax_oracle.calculate(income)):
+            got = results[field][i]
+            if not math.isclose(got, want, rel_tol=rel_tol, abs_tol=abs_tol):
+                mismatches.append((income, field, got, want))
+    return mismatches
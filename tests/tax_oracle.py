@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Python tax oracle for Sri Lanka Personal Income Tax (2024/2025)
+
+Independent source of truth for the slabs in utils/taxCalculator.js. Cumulative
+tax at the start of every slab is precomputed, so any income is looked up with
+a binary search instead of walking the brackets. `calculate_array` does the
+same for millions of incomes at once with NumPy.
+
+Regenerate the golden values in test_data.json with:
+
+    python -m tests.tax_oracle --regenerate-fixtures
+"""
+
+import argparse
+import json
+import math
+import os
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for calculate_array
+    np = None
+
+TEST_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data.json')
+
+TAX_FREE_THRESHOLD = 1200000  # Rs. 1.2M per year
+TAX_BRACKETS = [
+    (500000, 0.06),
+    (500000, 0.12),
+    (500000, 0.18),
+    (500000, 0.24),
+    (500000, 0.30),
+    (math.inf, 0.36),
+]
+
+
+def _build_table():
+    """Return (slab start incomes, marginal rates, tax owed at each slab start)"""
+    starts, rates, cumulative = [0], [0.0], [0.0]  # tax-free band
+    start, owed = TAX_FREE_THRESHOLD, 0.0
+    for limit, rate in TAX_BRACKETS:
+        starts.append(start)
+        rates.append(rate)
+        cumulative.append(owed)
+        owed += limit * rate
+        start += limit
+    return starts, rates, cumulative
+
+
+SLAB_STARTS, SLAB_RATES, CUMULATIVE_TAX = _build_table()
+
+
+def total_tax(income):
+    """Annual tax on `income`"""
+    if not income or math.isnan(income) or income < 0:
+        return 0.0
+    i = bisect_right(SLAB_STARTS, income) - 1
+    return CUMULATIVE_TAX[i] + (income - SLAB_STARTS[i]) * SLAB_RATES[i]
+
+
+def calculate(income):
+    """Mirror of calculateTax: (taxableIncome, totalTax, monthlyTax, effectiveRate)"""
+    if not income or math.isnan(income):
+        return (0.0, 0.0, 0.0, 0.0)
+    tax = total_tax(income)
+    return (max(0, income - TAX_FREE_THRESHOLD), tax, tax / 12, tax / income * 100)
+
+
+def calculate_array(incomes):
+    """Vectorized `calculate` over an array of incomes
+
+    Returns {'taxableIncome', 'totalTax', 'monthlyTax', 'effectiveRate'} as
+    float64 arrays. Zero or NaN incomes give all-zero rows, like calculateTax.
+    """
+    if np is None:
+        raise ImportError("calculate_array requires NumPy: pip install numpy")
+
+    incomes = np.asarray(incomes, dtype=np.float64)
+    valid = (incomes != 0) & ~np.isnan(incomes)
+    clean = np.where(valid, incomes, 0.0)
+
+    starts = np.asarray(SLAB_STARTS, dtype=np.float64)
+    index = np.maximum(np.searchsorted(starts, clean, side='right') - 1, 0)
+    tax = np.asarray(CUMULATIVE_TAX)[index] + (clean - starts[index]) * np.asarray(SLAB_RATES)[index]
+    tax = np.where(clean > 0, tax, 0.0)
+
+    effective = np.zeros_like(clean)
+    np.divide(tax * 100, clean, out=effective, where=valid)
+
+    return {
+        'taxableIncome': np.maximum(clean - TAX_FREE_THRESHOLD, 0.0),
+        'totalTax': tax,
+        'monthlyTax': tax / 12,
+        'effectiveRate': effective,
+    }
+
+
+def slab_edges():
+    """Incomes at which a new marginal rate starts (threshold included)"""
+    return SLAB_STARTS[1:]
+
+
+def regenerate_fixtures(path=TEST_DATA_PATH):
+    """Rewrite expectedTax for every valid user in test_data.json from the oracle
+
+    Returns a list of (name, old value, new value) for entries that changed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    changed = []
+    for user in data['valid_users']:
+        tax = total_tax(float(user['income']))
+        expected = int(tax) if tax.is_integer() else round(tax, 2)
+        if user.get('expectedTax') != expected:
+            changed.append((user['name'], user.get('expectedTax'), expected))
+            user['expectedTax'] = expected
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=4, ensure_ascii=False))
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sri Lanka income tax oracle")
+    parser.add_argument('incomes', nargs='*', type=float, help="annual incomes to evaluate")
+    parser.add_argument('--regenerate-fixtures', action='store_true',
+                        help="rewrite expectedTax values in test_data.json")
+    args = parser.parse_args(argv)
+
+    for income in args.incomes:
+        taxable, tax, monthly, rate = calculate(income)
+        print(f"Rs. {income:,.2f}: taxable {taxable:,.2f}, tax {tax:,.2f} "
+              f"({monthly:,.2f}/month, {rate:.2f}% effective)")
+
+    if args.regenerate_fixtures:
+        changed = regenerate_fixtures()
+        for name, old, new in changed:
+            print(f"  {name}: expectedTax {old} -> {new}")
+        print(f"✅ Regenerated test_data.json ({len(changed)} values changed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Synthetic taxpayer profiles and cached, schema-checked fixture loading
+
+`generate_profiles` lazily yields realistic profiles: names in English,
+Sinhala and Tamil script, valid, formatted, omitted and malformed TINs, and
+incomes that hit every tax slab edge (one rupee either side) as well as a
+log-uniform spread. Invalid profiles break one field and list it in `errors`,
+following the rules in utils/validation.js. `write_jsonl` streams any number
+of them to disk in constant memory.
+
+`load_test_data` and `load_profiles` parse a file once per process and serve
+later calls from memory until the file changes on disk, after checking it
+against the expected schema. `iter_profiles` streams a large JSONL file with
+the same per-record check.
+
+    python -m tests.taxpayer_data --count 1000000 --seed 1 --output taxpayers.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+
+from tests.tax_oracle import slab_edges, total_tax
+
+TEST_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data.json')
+
+LANGUAGES = ['en', 'si', 'ta']
+SOURCES = ['employment', 'business', 'investment', 'rental', 'other']
+
+FIRST_NAMES = {
+    'en': ['Ashan', 'Nimalka', 'Rajesh', 'Dilani', 'Kasun', 'Priya', 'Tharindu', 'Shanika'],
+    'si': ['අශාන්', 'නිමල්කා', 'කසුන්', 'දිලානි', 'චමරි', 'රුවන්', 'තරිඳු', 'ශානිකා'],
+    'ta': ['ராஜேஷ்', 'பிரியா', 'குமார்', 'கவிதா', 'செல்வம்', 'மீனா', 'அருண்', 'லதா'],
+}
+LAST_NAMES = {
+    'en': ['Perera', 'Silva', 'Kumar', 'Fernando', 'Jayasinghe', 'Bandara'],
+    'si': ['පෙරේරා', 'සිල්වා', 'ප්‍රනාන්දු', 'ජයසිංහ', 'බණ්ඩාර', 'දිසානායක'],
+    'ta': ['குமார்', 'சிவராஜா', 'நடராஜா', 'கணேசன்', 'இராமலிங்கம்', 'செல்வராஜா'],
+}
+
+# Field values each rejected by utils/validation.js (isRequired, isValidTIN,
+# isValidEmail, isValidIncome)
+INVALID_VALUES = {
+    'name': ['', '   '],
+    'tin': ['12345678', '1234567890', 'ABC-DEF'],
+    'email': ['notanemail', 'user@', '@example.lk'],
+    'income': ['', '-1000', 'abc'],
+}
+
+EDGE_RATIO = 0.4  # share of valid incomes placed on a slab edge
+INCOME_RANGE = (100000, 20000000)
+
+# {field: allowed types}; expectedTax is None for invalid profiles
+PROFILE_SCHEMA = {
+    'id': int, 'language': str, 'name': str, 'tin': str, 'email': str, 'income': str,
+    'sources': list, 'valid': bool, 'errors': list, 'expectedTax': (int, float, type(None)),
+}
+USER_SCHEMA = {'name': str, 'tin': str, 'email': str, 'income': str, 'expectedTax': (int, float), 'description': str}
+VIEWPORT_SCHEMA = {'width': int, 'height': int, 'name': str}
+WIZARD_STATE_SCHEMA = {'currentStep': int, 'language': str, 'wizardData': dict}
+TEST_DATA_SCHEMA = {
+    'valid_users': list, 'invalid_inputs': dict, 'languages': list, 'themes': list,
+    'translation_keys': list, 'viewports': dict, 'wizard_states': dict,
+}
+
+_cache = {}
+
+
+def expected_tax(income):
+    """Oracle tax rounded the way test_data.json stores expectedTax"""
+    tax = total_tax(float(income))
+    return int(tax) if tax.is_integer() else round(tax, 2)
+
+
+def _income(rng, edge_incomes):
+    if rng.random() < EDGE_RATIO:
+        return rng.choice(edge_incomes)
+    low, high = INCOME_RANGE
+    return round(math.exp(rng.uniform(math.log(low), math.log(high))), -3)
+
+
+def _tin(rng):
+    roll = rng.random()
+    digits = f"{rng.randrange(10 ** 9):09d}"
+    if roll < 0.7:
+        return digits
+    if roll < 0.85:
+        return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"  # isValidTIN ignores non-digits
+    return ''  # TIN is optional
+
+
+def generate_profiles(count=None, seed=0, invalid_ratio=0.1):
+    """Yield `count` profiles (endless if None), reproducible for a given seed"""
+    rng = random.Random(seed)
+    # Zero, and each slab edge with one rupee either side
+    edge_incomes = [0] + [edge + delta for edge in slab_edges() for delta in (-1, 0, 1)]
+    for index in itertools.count() if count is None else range(count):
+        language = rng.choice(LANGUAGES)
+        income = int(_income(rng, edge_incomes))
+        profile = {
+            'id': index,
+            'language': language,
+            'name': f"{rng.choice(FIRST_NAMES[language])} {rng.choice(LAST_NAMES[language])}",
+            'tin': _tin(rng),
+            'email': f"taxpayer{index}@example.lk" if rng.random() < 0.6 else '',
+            'income': str(income),
+            'sources': rng.sample(SOURCES, rng.randint(1, 3)),
+            'valid': True,
+            'errors': [],
+            'expectedTax': expected_tax(income),
+        }
+        if rng.random() < invalid_ratio:
+            field = rng.choice(list(INVALID_VALUES))
+            profile.update({field: rng.choice(INVALID_VALUES[field]), 'valid': False, 'errors': [field]})
+            profile['expectedTax'] = None
+        yield profile
+
+
+def write_jsonl(profiles, path):
+    """Stream `profiles` to `path`, one JSON object per line; return the count"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for profile in profiles:
+            f.write(json.dumps(profile, ensure_ascii=False))
+            f.write('\n')
+            written += 1
+    return written
+
+
+def _check(record, schema, where):
+    """Raise ValueError unless `record` has every schema field with a matching type"""
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: expected an object, got {type(record).__name__}")
+    for field, types in schema.items():
+        if field not in record:
+            raise ValueError(f"{where}: missing field {field!r}")
+        value = record[field]
+        # bool is an int subclass; only accept it where bool is expected
+        if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+            raise ValueError(f"{where}: field {field!r} has type {type(value).__name__}")
+
+
+def validate_test_data(data, where='test_data.json'):
+    """Check the structure of test_data.json; raise ValueError on the first problem"""
+    _check(data, TEST_DATA_SCHEMA, where)
+    for i, user in enumerate(data['valid_users']):
+        _check(user, USER_SCHEMA, f"{where}: valid_users[{i}]")
+    for category, viewports in data['viewports'].items():
+        for i, viewport in enumerate(viewports):
+            _check(viewport, VIEWPORT_SCHEMA, f"{where}: viewports.{category}[{i}]")
+    for name, state in data['wizard_states'].items():
+        _check(state, WIZARD_STATE_SCHEMA, f"{where}: wizard_states.{name}")
+        if state['language'] not in data['languages']:
+            raise ValueError(f"{where}: wizard_states.{name} uses unknown language {state['language']!r}")
+    for key in ('languages', 'themes', 'translation_keys'):
+        if not all(isinstance(value, str) for value in data[key]):
+            raise ValueError(f"{where}: {key} must be a list of strings")
+
+
+def _cached(path, parse):
+    """parse(path), reused until the file's mtime or size changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _cache.get(path)
+    if entry is None or entry[0] != stamp:
+        entry = _cache[path] = (stamp, parse(path))
+    return entry[1]
+
+
+def _parse_test_data(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    validate_test_data(data, os.path.basename(path))
+    return data
+
+
+def load_test_data(path=TEST_DATA_PATH):
+    """Parsed, validated test_data.json, shared by every caller in the process
+
+    Treat the result as read-only; copy anything you need to modify.
+    """
+    return _cached(path, _parse_test_data)
+
+
+def iter_profiles(path):
+    """Stream validated profiles from a JSONL file in constant memory"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                profile = json.loads(line)
+                _check(profile, PROFILE_SCHEMA, f"{os.path.basename(path)}:{line_number}")
+                yield profile
+
+
+def load_profiles(path):
+    """All profiles in a JSONL file as a cached list (read-only, like load_test_data)"""
+    return _cached(path, lambda p: list(iter_profiles(p)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic taxpayer profiles as JSONL")
+    parser.add_argument('--count', type=int, default=100000, help="profiles to write (default: 100000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invalid-ratio', type=float, default=0.1, help="share of profiles with one invalid field")
+    parser.add_argument('--output', required=True, help="JSONL path to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = write_jsonl(generate_profiles(args.count, args.seed, args.invalid_ratio), args.output)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Wrote {written} profiles to {args.output} in {elapsed:.2f}s ({written / elapsed:,.0f}/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,26 +4,19 @@ Test: Multi-Language Support Testing
 Tests language toggle and translation display
 """
 
-from playwright.sync_api import sync_playwright
 import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-from selectors import Selectors, TestHelpers
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
+from tests.state_observer import StateObserver
+from tests.translation_index import analyze, failures
 
 def test_language_toggle():
     """Test cycling through all three languages"""
     print("🧪 Testing Language Toggle...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Initial language should be English
@@ -36,7 +29,7 @@ def test_language_toggle():
             
             # Click to switch to Sinhala
             lang_button.click()
-            page.wait_for_timeout(300)
+            Waits.for_language(page, 'si')
             
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
             assert 'SI' in lang_text, f"Expected SI, got {lang_text}"
@@ -46,7 +39,7 @@ def test_language_toggle():
             
             # Click to switch to Tamil
             page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
-            page.wait_for_timeout(300)
+            Waits.for_language(page, 'ta')
             
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
             assert 'TA' in lang_text, f"Expected TA, got {lang_text}"
@@ -56,7 +49,7 @@ def test_language_toggle():
             
             # Click to cycle back to English
             page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
-            page.wait_for_timeout(300)
+            Waits.for_language(page, 'en')
             
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
             assert 'EN' in lang_text, f"Expected EN, got {lang_text}"
@@ -65,25 +58,16 @@ def test_language_toggle():
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
             TestHelpers.take_screenshot(page, 'tests/screenshots/error_language.png')
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_translation_display():
     """Test that content changes in different languages"""
     print("\n🧪 Testing Translation Display...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Get content in English
@@ -93,7 +77,7 @@ def test_translation_display():
             
             # Switch to Sinhala
             page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_language(page, 'si')
             
             # Get content in Sinhala
             page_content_si = page.content()
@@ -103,7 +87,7 @@ def test_translation_display():
             
             # Switch to Tamil
             page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_language(page, 'ta')
             
             # Get content in Tamil
             page_content_ta = page.content()
@@ -114,30 +98,21 @@ def test_translation_display():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_language_persistence():
     """Test that language choice persists across navigation"""
     print("\n🧪 Testing Language Persistence...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Switch to Sinhala
             page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
-            page.wait_for_timeout(300)
+            Waits.for_language(page, 'si')
             
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
             assert 'SI' in lang_text, "Should be in Sinhala"
@@ -145,7 +120,7 @@ def test_language_persistence():
             # Fill form and navigate to Step 2
             TestHelpers.fill_step1_form(page)
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             # Check language is still Sinhala
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
@@ -154,7 +129,7 @@ def test_language_persistence():
             
             # Navigate back to Step 1
             page.locator(Selectors.BACK_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 1)
             
             # Check language is still Sinhala
             lang_text = page.locator(Selectors.LANGUAGE_TOGGLE).first.text_content()
@@ -163,10 +138,64 @@ def test_language_persistence():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
+
+
+def test_translation_coverage():
+    """Test translation coverage statically from data/translations.js (no browser)"""
+    print("\n🧪 Testing Translation Coverage...")
+    
+    try:
+        # Same checks, and same verdict, as `python -m tests.translation_index`
+        report = analyze()
+        problems = failures(report)
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        assert not problems, f"{len(problems)} translation problems (see python -m tests.translation_index)"
+        print(f"✅ {report['keys']} keys render translated, in the right script, in {', '.join(report['languages'])}")
         
-        browser.close()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+def test_state_event_timeline():
+    """Test that language and theme transitions are pushed in order"""
+    print("\n🧪 Testing State Event Timeline...")
+    
+    with BrowserSession.new_page() as page:
+        try:
+            observer = StateObserver.attach(page)
+            page.goto(BASE_URL)
+            TestHelpers.wait_for_navigation(page)
+            
+            initial_theme = observer.wait_for(lambda e: e.kind == 'theme', 'initial theme').value
+            other_theme = 'dark' if initial_theme == 'light' else 'light'
+            
+            since = observer.mark()
+            page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
+            si = observer.wait_for_language('si', since=since)
+            
+            since = observer.mark()
+            page.locator(Selectors.THEME_TOGGLE).first.click()
+            theme = observer.wait_for_theme(other_theme, since=since)
+            
+            since = observer.mark()
+            page.locator(Selectors.LANGUAGE_TOGGLE).first.click()
+            ta = observer.wait_for_language('ta', since=since)
+            
+            assert si.time < theme.time < ta.time, "Transitions should be recorded in the order they happened"
+            assert si.previous['language'] == 'en', f"Sinhala should follow English, got {si.previous['language']}"
+            print("✅ Transitions pushed in order: en → si, theme → " + other_theme + ", si → ta")
+            
+            for offset, kind, key, value in observer.timeline():
+                summary = value.get('language') if isinstance(value, dict) else value
+                print(f"  {offset:8.1f} ms  {kind:<8} {key:<18} {summary}")
+            print(f"✅ Max page → Python delivery: {max(observer.delivery_latencies()):.1f} ms")
+            
+        except AssertionError as e:
+            print(f"❌ Test failed: {e}")
+            sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -174,9 +203,11 @@ if __name__ == '__main__':
     print("MULTI-LANGUAGE TESTS")
     print("=" * 60)
     
+    test_translation_coverage()
     test_language_toggle()
     test_translation_display()
     test_language_persistence()
+    test_state_event_timeline()
     
     print("\n" + "=" * 60)
     print("✅ ALL LANGUAGE TESTS PASSED")
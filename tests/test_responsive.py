@@ -4,19 +4,16 @@ Test: Responsive Design Testing
 Tests the wizard across different viewport sizes
 """
 
-from playwright.sync_api import sync_playwright
-import json
 import sys
-import os
+import time
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-from selectors import Selectors, TestHelpers
+from tests.responsive_matrix import load_matrix, run_matrix_sync
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers
+from tests.taxpayer_data import load_test_data
 
 def load_viewports():
     """Load viewport configurations from test data"""
-    with open('tests/test_data.json', 'r') as f:
-        data = json.load(f)
-    return data['viewports']
+    return load_test_data()['viewports']
 
 
 def test_mobile_viewports():
@@ -25,16 +22,12 @@ def test_mobile_viewports():
     
     viewports = load_viewports()
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    for mobile in viewports['mobile']:
+        print(f"\n  Testing {mobile['name']} ({mobile['width']}x{mobile['height']})...")
         
-        for mobile in viewports['mobile']:
-            print(f"\n  Testing {mobile['name']} ({mobile['width']}x{mobile['height']})...")
-            
-            page = browser.new_page(viewport={'width': mobile['width'], 'height': mobile['height']})
-            
+        with BrowserSession.new_page(viewport={'width': mobile['width'], 'height': mobile['height']}) as page:
             try:
-                page.goto('http://localhost:3000')
+                page.goto(BASE_URL)
                 TestHelpers.wait_for_navigation(page)
                 
                 # Check header is visible
@@ -64,13 +57,7 @@ def test_mobile_viewports():
                 
             except AssertionError as e:
                 print(f"  ❌ Test failed for {mobile['name']}: {e}")
-                page.close()
-                browser.close()
                 sys.exit(1)
-            
-            page.close()
-        
-        browser.close()
     
     print("✅ All mobile viewports tested successfully")
 
@@ -81,16 +68,12 @@ def test_tablet_viewports():
     
     viewports = load_viewports()
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    for tablet in viewports['tablet']:
+        print(f"\n  Testing {tablet['name']} ({tablet['width']}x{tablet['height']})...")
         
-        for tablet in viewports['tablet']:
-            print(f"\n  Testing {tablet['name']} ({tablet['width']}x{tablet['height']})...")
-            
-            page = browser.new_page(viewport={'width': tablet['width'], 'height': tablet['height']})
-            
+        with BrowserSession.new_page(viewport={'width': tablet['width'], 'height': tablet['height']}) as page:
             try:
-                page.goto('http://localhost:3000')
+                page.goto(BASE_URL)
                 TestHelpers.wait_for_navigation(page)
                 
                 # All elements should be visible on tablet
@@ -112,13 +95,7 @@ def test_tablet_viewports():
                 
             except AssertionError as e:
                 print(f"  ❌ Test failed for {tablet['name']}: {e}")
-                page.close()
-                browser.close()
                 sys.exit(1)
-            
-            page.close()
-        
-        browser.close()
     
     print("✅ All tablet viewports tested successfully")
 
@@ -129,16 +106,12 @@ def test_desktop_viewports():
     
     viewports = load_viewports()
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    for desktop in viewports['desktop']:
+        print(f"\n  Testing {desktop['name']} ({desktop['width']}x{desktop['height']})...")
         
-        for desktop in viewports['desktop']:
-            print(f"\n  Testing {desktop['name']} ({desktop['width']}x{desktop['height']})...")
-            
-            page = browser.new_page(viewport={'width': desktop['width'], 'height': desktop['height']})
-            
+        with BrowserSession.new_page(viewport={'width': desktop['width'], 'height': desktop['height']}) as page:
             try:
-                page.goto('http://localhost:3000')
+                page.goto(BASE_URL)
                 TestHelpers.wait_for_navigation(page)
                 
                 # Everything should be visible on desktop
@@ -160,17 +133,36 @@ def test_desktop_viewports():
                 
             except AssertionError as e:
                 print(f"  ❌ Test failed for {desktop['name']}: {e}")
-                page.close()
-                browser.close()
                 sys.exit(1)
-            
-            page.close()
-        
-        browser.close()
     
     print("✅ All desktop viewports tested successfully")
 
 
+def test_viewport_matrix():
+    """Test every viewport x language x theme cell concurrently"""
+    print("\n🧪 Testing Viewport x Language x Theme Matrix...")
+    
+    cells = load_matrix()
+    start = time.perf_counter()
+    results = run_matrix_sync(cells)
+    elapsed = time.perf_counter() - start
+    
+    try:
+        for result in results:
+            if result['passed']:
+                print(f"  ✅ {result['id']}")
+            else:
+                print(f"  ❌ {result['id']}: {result['error']} (see {result['screenshot']})")
+        
+        failed = [result['id'] for result in results if not result['passed']]
+        assert not failed, f"{len(failed)} of {len(cells)} cells failed"
+        print(f"✅ All {len(cells)} cells verified in {elapsed:.2f}s")
+        
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("RESPONSIVE DESIGN TESTS")
@@ -179,6 +171,7 @@ if __name__ == '__main__':
     test_mobile_viewports()
     test_tablet_viewports()
     test_desktop_viewports()
+    test_viewport_matrix()
     
     print("\n" + "=" * 60)
     print("✅ ALL RESPONSIVE TESTS PASSED")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test: Tax Calculation Testing
+Evaluates utils/taxCalculator.js in the browser over large income grids
+"""
+
+import sys
+import time
+
+from tests import tax_oracle
+from tests.selectors import BrowserSession
+from tests.tax_harness import (
+    bracket_boundary_incomes,
+    compare_with_reference,
+    evaluate_tax_batch,
+    load_tax_calculator,
+)
+from tests.taxpayer_data import load_test_data
+
+def test_tax_grid_matches_reference():
+    """Test calculateTax against the Python tax oracle over every slab edge"""
+    print("🧪 Testing Tax Calculation Grid...")
+
+    incomes = bracket_boundary_incomes()
+
+    with BrowserSession.new_page() as page:
+        try:
+            # The calculator is loaded on its own; no dev server needed
+            page.set_content("<!doctype html><title>Tax harness</title>")
+            load_tax_calculator(page)
+
+            start = time.perf_counter()
+            results = evaluate_tax_batch(page, incomes)
+            elapsed = time.perf_counter() - start
+            print(f"  Evaluated {len(incomes):,} incomes in one round-trip ({elapsed:.2f}s)")
+
+            mismatches = compare_with_reference(incomes, results)
+            for income, field, got, want in mismatches[:10]:
+                print(f"  ❌ income={income}: {field} = {got}, expected {want}")
+            assert not mismatches, f"{len(mismatches)} results differ from the oracle"
+
+            print("✅ calculateTax matches the oracle on every income")
+
+        except AssertionError as e:
+            print(f"❌ Test failed: {e}")
+            sys.exit(1)
+
+
+def test_golden_values():
+    """Test the expectedTax fixtures against both the oracle and the browser"""
+    print("\n🧪 Testing Golden Tax Values...")
+
+    users = load_test_data()['valid_users']
+    incomes = [float(user['income']) for user in users]
+
+    with BrowserSession.new_page() as page:
+        try:
+            page.set_content("<!doctype html><title>Tax harness</title>")
+            load_tax_calculator(page)
+            browser_tax = evaluate_tax_batch(page, incomes)['totalTax']
+
+            for user, income, tax in zip(users, incomes, browser_tax):
+                oracle_tax = tax_oracle.total_tax(income)
+                assert user['expectedTax'] == oracle_tax, (
+                    f"{user['name']}: fixture says {user['expectedTax']}, oracle says {oracle_tax} "
+                    "(run python -m tests.tax_oracle --regenerate-fixtures)"
+                )
+                assert tax == oracle_tax, f"{user['name']}: browser computed {tax}, expected {oracle_tax}"
+                print(f"  ✅ {user['description']}: Rs. {tax:,.2f}")
+
+            print("✅ Golden values match the oracle and the app")
+
+        except AssertionError as e:
+            print(f"❌ Test failed: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("TAX CALCULATION TESTS")
+    print("=" * 60)
+
+    test_tax_grid_matches_reference()
+    test_golden_values()
+
+    print("\n" + "=" * 60)
+    print("✅ ALL TAX CALCULATION TESTS PASSED")
+    print("=" * 60)
@@ -4,26 +4,19 @@ Test: Theme Toggle Testing
 Tests light/dark mode toggle and persistence
 """
 
-from playwright.sync_api import sync_playwright
 import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-from selectors import Selectors, TestHelpers
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
+from tests.taxpayer_data import load_test_data
+from tests.visual_diff import VisualRegression, describe
 
 def test_theme_toggle():
     """Test switching between light and dark themes"""
     print("🧪 Testing Theme Toggle...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Get initial theme
@@ -35,7 +28,7 @@ def test_theme_toggle():
             # Click theme toggle
             theme_button = page.locator(Selectors.THEME_TOGGLE).first
             theme_button.click()
-            page.wait_for_timeout(500)  # Wait for transition
+            Waits.for_theme_change(page, initial_theme)
             
             # Get new theme
             new_theme = TestHelpers.get_theme(page)
@@ -46,7 +39,7 @@ def test_theme_toggle():
             
             # Toggle back
             theme_button.click()
-            page.wait_for_timeout(500)
+            Waits.for_theme(page, initial_theme)
             
             final_theme = TestHelpers.get_theme(page)
             assert final_theme == initial_theme, f"Should return to {initial_theme}"
@@ -55,25 +48,16 @@ def test_theme_toggle():
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
             TestHelpers.take_screenshot(page, 'tests/screenshots/error_theme.png')
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_theme_persistence():
     """Test that theme choice persists in localStorage"""
     print("\n🧪 Testing Theme Persistence...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Get initial theme
@@ -81,7 +65,7 @@ def test_theme_persistence():
             
             # Toggle theme
             page.locator(Selectors.THEME_TOGGLE).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_theme_change(page, initial_theme)
             
             toggled_theme = TestHelpers.get_theme(page)
             
@@ -101,34 +85,27 @@ def test_theme_persistence():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_theme_visual_changes():
     """Test that theme toggle causes visual changes"""
     print("\n🧪 Testing Theme Visual Changes...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Get background color in initial theme
+            initial_theme = TestHelpers.get_theme(page)
             initial_bg = page.evaluate("() => getComputedStyle(document.body).backgroundColor")
             print(f"Initial background: {initial_bg}")
             
             # Toggle theme
             page.locator(Selectors.THEME_TOGGLE).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_theme_change(page, initial_theme)
+            Waits.for_animations_idle(page)  # Background color transitions
             
             # Get background color after toggle
             toggled_bg = page.evaluate("() => getComputedStyle(document.body).backgroundColor")
@@ -140,12 +117,47 @@ def test_theme_visual_changes():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
+def test_visual_regression():
+    """Test every step x language x theme x viewport against its visual baseline"""
+    print("\n🧪 Testing Visual Regression...")
+    
+    state = TestHelpers.load_wizard_state('step5_summary')
+    # One viewport per category: mobile, tablet and desktop
+    viewports = [entries[0] for entries in load_test_data()['viewports'].values()]
+    
+    try:
+        with VisualRegression() as visual:
+            for viewport in viewports:
+                size = {'width': viewport['width'], 'height': viewport['height']}
+                for step in range(1, 6):
+                    for language in ('en', 'si', 'ta'):
+                        for theme in ('light', 'dark'):
+                            seed = dict(state, currentStep=step, language=language)
+                            # With no stored theme, ThemeProvider follows prefers-color-scheme
+                            with BrowserSession.new_page(seed=seed, viewport=size, color_scheme=theme) as page:
+                                page.goto(BASE_URL)
+                                TestHelpers.wait_for_navigation(page)
+                                Waits.for_step(page, step)
+                                Waits.for_theme(page, theme)
+                                Waits.for_animations_idle(page)
+                                visual.check(page, step, language, theme, size)
+            
+            results = visual.results()
+        
+        for result in results:
+            print(f"  {describe(result)}")
+        failed = [result['key'] for result in results if result['status'] == 'failed']
+        assert not failed, f"{len(failed)} screens differ from their baselines: {', '.join(failed)}"
+        recorded = sum(1 for result in results if result['status'] in ('new', 'updated'))
+        print(f"✅ {len(results) - recorded} screens match their baselines, {recorded} baselines recorded")
+        
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
 if __name__ == '__main__':
     print("=" * 60)
     print("THEME TOGGLE TESTS")
@@ -154,6 +166,7 @@ if __name__ == '__main__':
     test_theme_toggle()
     test_theme_persistence()
     test_theme_visual_changes()
+    test_visual_regression()
     
     print("\n" + "=" * 60)
     print("✅ ALL THEME TESTS PASSED")
@@ -4,66 +4,48 @@ Test: Form Validation Testing
 Tests all form validations in the wizard
 """
 
-from playwright.sync_api import sync_playwright
 import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-from selectors import Selectors, TestHelpers
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
+from tests.validation_fuzz import ValidationFuzzer
 
 def test_required_fields():
     """Test that required fields show error messages"""
     print("🧪 Testing Required Field Validation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Try to click Next without filling anything
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_validation(page, from_step=1)
             
             # Should still be on Step 1 due to validation
-            current_step = TestHelpers.get_current_step(page)
-            assert current_step == 1, "Should not advance with empty required fields"
+            snapshot = TestHelpers.snapshot(page)
+            assert snapshot.step == 1, "Should not advance with empty required fields"
             print("✅ Prevented advancement with empty required fields")
             
             # Check for error messages
-            errors = page.locator(Selectors.ERROR_MESSAGE).all()
-            assert len(errors) > 0, "Expected error messages to be displayed"
-            print(f"✅ Error messages displayed: {len(errors)} found")
+            assert len(snapshot.errors) > 0, "Expected error messages to be displayed"
+            print(f"✅ Error messages displayed: {len(snapshot.errors)} found")
             
             TestHelpers.take_screenshot(page, 'tests/screenshots/validation_required.png')
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
             TestHelpers.take_screenshot(page, 'tests/screenshots/error_validation.png')
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_tin_validation():
     """Test TIN field validation (must be 9 digits)"""
     print("\n🧪 Testing TIN Validation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Fill form with invalid TIN (too short)
@@ -74,7 +56,7 @@ def test_tin_validation():
             
             # Try to advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_validation(page, from_step=1)
             
             # Should still be on Step 1
             current_step = TestHelpers.get_current_step(page)
@@ -86,7 +68,7 @@ def test_tin_validation():
             
             # Now should advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 2, "Should advance with valid TIN"
@@ -94,25 +76,16 @@ def test_tin_validation():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_email_validation():
     """Test email field validation"""
     print("\n🧪 Testing Email Validation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Fill form with invalid email
@@ -123,7 +96,7 @@ def test_email_validation():
             
             # Try to advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_validation(page, from_step=1)
             
             # Should still be on Step 1
             current_step = TestHelpers.get_current_step(page)
@@ -135,7 +108,7 @@ def test_email_validation():
             
             # Now should advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 2, "Should advance with valid email"
@@ -143,25 +116,16 @@ def test_email_validation():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_income_validation():
     """Test income field validation (must be positive)"""
     print("\n🧪 Testing Income Validation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Fill form with zero income
@@ -172,7 +136,7 @@ def test_income_validation():
             
             # Try to advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_validation(page, from_step=1)
             
             # Should still be on Step 1
             current_step = TestHelpers.get_current_step(page)
@@ -184,7 +148,7 @@ def test_income_validation():
             
             # Now should advance
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 2, "Should advance with valid income"
@@ -192,10 +156,27 @@ def test_income_validation():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
+
+
+def test_validation_fuzzing():
+    """Fuzz utils/validation.js directly with batched adversarial inputs"""
+    print("\n🧪 Testing Validation Properties (fuzzing)...")
+    
+    with BrowserSession.new_page() as page:
+        try:
+            fuzzer = ValidationFuzzer(page, seed=20250101)
+            fuzzer.load()
+            counterexamples = fuzzer.run(batches=5, batch_size=2000)
+            
+            for name, value in counterexamples.items():
+                print(f"  ❌ {name}: minimal counterexample {value!r}")
+            assert not counterexamples, f"{len(counterexamples)} validation properties violated"
+            print(f"✅ {fuzzer.cases_run:,} fuzzed inputs passed in {fuzzer.round_trips} round-trips")
+            
+        except AssertionError as e:
+            print(f"❌ Test failed: {e}")
+            sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -206,6 +187,7 @@ if __name__ == '__main__':
     test_required_fields()
     test_tin_validation()
     test_income_validation()
+    test_validation_fuzzing()
     
     print("\n" + "=" * 60)
     print("✅ ALL VALIDATION TESTS PASSED")
@@ -4,30 +4,18 @@ Test: Wizard Functional Testing
 Tests core wizard navigation and functionality
 """
 
-from playwright.sync_api import sync_playwright
 import sys
-import os
 
-# Add tests directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-from selectors import Selectors, TestHelpers
+from tests.selectors import BASE_URL, BrowserSession, Selectors, TestHelpers, Waits
 
 def test_wizard_navigation():
     """Test forward and backward navigation through wizard steps"""
     print("🧪 Testing Wizard Navigation...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
             # Navigate to the app
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            
-            # Clear any existing state
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Take initial screenshot
@@ -47,7 +35,7 @@ def test_wizard_navigation():
             
             # Click Next to go to Step 2
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 2, f"Expected Step 2, got {current_step}"
@@ -62,7 +50,7 @@ def test_wizard_navigation():
             
             # Click Next to go to Step 3
             page.locator(Selectors.NEXT_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 3)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 3, f"Expected Step 3, got {current_step}"
@@ -72,7 +60,7 @@ def test_wizard_navigation():
             
             # Test backward navigation
             page.locator(Selectors.BACK_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 2)
             
             current_step = TestHelpers.get_current_step(page)
             assert current_step == 2, f"Expected Step 2 after back, got {current_step}"
@@ -80,14 +68,15 @@ def test_wizard_navigation():
             
             # Go back to Step 1
             page.locator(Selectors.BACK_BUTTON).first.click()
-            page.wait_for_timeout(500)
+            Waits.for_step(page, 1)
             
-            current_step = TestHelpers.get_current_step(page)
-            assert current_step == 1, f"Expected Step 1 after back, got {current_step}"
+            snapshot = TestHelpers.snapshot(page)
+            assert snapshot.step == 1, f"Expected Step 1 after back, got {snapshot.step}"
             
             # Verify data persistence - check if name is still filled
-            name_value = page.locator(Selectors.INPUT_NAME).input_value()
+            name_value = snapshot.fields.get('name')
             assert name_value == "Test User", f"Name not persisted: {name_value}"
+            assert snapshot.wizard_data.get('name') == "Test User", "Name should be saved to localStorage"
             print("✅ Data persisted after backward navigation")
             
             print("✅ All wizard navigation tests passed!")
@@ -95,30 +84,20 @@ def test_wizard_navigation():
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
             TestHelpers.take_screenshot(page, 'tests/screenshots/error_wizard_nav.png')
-            browser.close()
             sys.exit(1)
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
             TestHelpers.take_screenshot(page, 'tests/screenshots/error_wizard_nav.png')
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 def test_step_indicator():
     """Test that step indicator updates correctly"""
     print("\n🧪 Testing Step Indicator...")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    with BrowserSession.new_page() as page:
         try:
-            page.goto('http://localhost:3000')
-            TestHelpers.wait_for_navigation(page)
-            TestHelpers.clear_local_storage(page)
-            page.reload()
+            page.goto(BASE_URL)
             TestHelpers.wait_for_navigation(page)
             
             # Check step indicator exists
@@ -135,10 +114,7 @@ def test_step_indicator():
             
         except AssertionError as e:
             print(f"❌ Test failed: {e}")
-            browser.close()
             sys.exit(1)
-        
-        browser.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,184 @@
+"""
+Per-action timing tracer
+
+`install()` wraps the public methods of Playwright's sync Browser,
+BrowserContext, Page and Locator classes, plus TestHelpers, Waits,
+BrowserSession.browser and the screenshot writer, so every action is recorded
+as a Chrome trace "complete" event with its start and duration. Whatever a
+span does not spend in a nested span is harness-side Python time.
+
+`write_trace` emits JSON for chrome://tracing or https://ui.perfetto.dev and
+`print_summary` lists the slowest actions by total time.
+
+    python -m tests.runner --trace trace.json --trace-top 20
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from playwright.sync_api import Browser, BrowserContext, BrowserType, Locator, Page
+
+from tests.screenshot_store import ScreenshotStore
+from tests.selectors import BrowserSession, TestHelpers, Waits
+
+# Methods that only build objects or manage listeners: no browser round-trip
+UNTRACED = {
+    'locator', 'get_by_alt_text', 'get_by_label', 'get_by_placeholder', 'get_by_role', 'get_by_test_id',
+    'get_by_text', 'get_by_title', 'frame_locator', 'nth', 'filter', 'and_', 'or_', 'describe',
+    'on', 'once', 'remove_listener', 'is_closed', 'set_default_timeout', 'set_default_navigation_timeout',
+}
+ARG_LIMIT = 120
+
+
+class Tracer:
+    """Collects trace events for the current process"""
+
+    def __init__(self):
+        self.events = []
+        # perf_counter is precise but has an arbitrary origin; anchor it to the
+        # wall clock so traces from several worker processes line up
+        self._offset = time.time() - time.perf_counter()
+
+    def now(self):
+        """Current time in trace microseconds"""
+        return (time.perf_counter() + self._offset) * 1e6
+
+    @contextmanager
+    def span(self, name, cat='harness', **args):
+        """Record the enclosed block as one complete ('X') event"""
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.events.append({
+                'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': self.now() - start,
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+            })
+
+    def drain(self):
+        """Return and forget the events recorded so far"""
+        events, self.events = self.events, []
+        return events
+
+
+TRACER = Tracer()
+_installed = False
+
+
+def _describe(args, kwargs):
+    """Short, JSON-safe rendering of a call's interesting arguments"""
+    described = {}
+    for i, value in enumerate(args):
+        if isinstance(value, Locator):
+            described['locator'] = repr(value)[:ARG_LIMIT]
+        elif isinstance(value, (str, int, float, bool)):
+            described[f'arg{i}'] = str(value)[:ARG_LIMIT]
+    for key, value in kwargs.items():
+        if isinstance(value, (str, int, float, bool, dict)):
+            described[key] = str(value)[:ARG_LIMIT]
+    return described
+
+
+def _traced(func, name, cat):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with TRACER.span(name, cat, **_describe(args, kwargs)):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _wrap_methods(cls, cat, prefix=None):
+    """Replace every public method of `cls` with a traced wrapper"""
+    prefix = prefix or cls.__name__
+    for name, attr in list(vars(cls).items()):
+        if name.startswith('_') or name in UNTRACED:
+            continue
+        if isinstance(attr, staticmethod):
+            setattr(cls, name, staticmethod(_traced(attr.__func__, f"{prefix}.{name}", cat)))
+        elif isinstance(attr, classmethod):
+            setattr(cls, name, classmethod(_traced(attr.__func__, f"{prefix}.{name}", cat)))
+        elif callable(attr) and not isinstance(attr, type):
+            setattr(cls, name, _traced(attr, f"{prefix}.{name}", cat))
+
+
+def install():
+    """Instrument Playwright and the harness helpers in this process (idempotent)"""
+    global _installed
+    if _installed:
+        return TRACER
+    for cls in (BrowserType, Browser, BrowserContext, Page, Locator):
+        _wrap_methods(cls, 'playwright')
+    _wrap_methods(TestHelpers, 'helpers')
+    _wrap_methods(Waits, 'waits')
+    # browser() includes starting Playwright and launching Chromium
+    BrowserSession.browser = classmethod(
+        _traced(BrowserSession.browser.__func__, 'BrowserSession.browser', 'session'))
+    ScreenshotStore._write = _traced(ScreenshotStore._write, 'ScreenshotStore.write', 'screenshot-io')
+    _installed = True
+    return TRACER
+
+
+def self_times(events):
+    """Map id(event) -> its duration minus the time spent in nested events"""
+    result = {}
+    lanes = {}
+    for event in events:
+        if event.get('ph') == 'X':
+            lanes.setdefault((event['pid'], event['tid']), []).append(event)
+    for lane in lanes.values():
+        lane.sort(key=lambda e: (e['ts'], -e['dur']))
+        stack = []
+        for event in lane:
+            while stack and stack[-1]['ts'] + stack[-1]['dur'] <= event['ts']:
+                stack.pop()
+            result[id(event)] = event['dur']
+            if stack:
+                result[id(stack[-1])] -= event['dur']
+            stack.append(event)
+    return result
+
+
+def summarize(events):
+    """{name: {'count', 'total', 'self', 'max'}} in milliseconds"""
+    own = self_times(events)
+    stats = {}
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        entry = stats.setdefault(event['name'], {'count': 0, 'total': 0.0, 'self': 0.0, 'max': 0.0, 'cat': event['cat']})
+        entry['count'] += 1
+        entry['total'] += event['dur'] / 1000
+        entry['self'] += own[id(event)] / 1000
+        entry['max'] = max(entry['max'], event['dur'] / 1000)
+    return stats
+
+
+def print_summary(events, top=15):
+    """Print the `top` slowest actions by total time, and harness Python time"""
+    stats = summarize(events)
+    ranked = sorted(((name, s) for name, s in stats.items() if s['cat'] != 'test'),
+                    key=lambda item: item[1]['total'], reverse=True)
+    print(f"{'action':<40}{'calls':>7}{'total ms':>11}{'self ms':>10}{'max ms':>10}")
+    for name, s in ranked[:top]:
+        print(f"{name[:39]:<40}{s['count']:>7}{s['total']:>11.1f}{s['self']:>10.1f}{s['max']:>10.1f}")
+
+    # Time inside a test not covered by any traced action is harness Python
+    tests = [s for s in stats.values() if s['cat'] == 'test']
+    if tests:
+        total = sum(s['total'] for s in tests)
+        python = sum(s['self'] for s in tests)
+        print(f"Harness Python outside traced actions: {python:.1f} ms of {total:.1f} ms test time")
+
+
+def write_trace(events, path):
+    """Write Chrome trace-event JSON, naming one track per process"""
+    metadata = [
+        {'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'worker {pid}'}}
+        for pid in sorted({event['pid'] for event in events})
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Static translation index and coverage analyzer for data/translations.js
+
+Parses the `translations` object once into a key x language index, without
+a browser or a server, and keeps it in memory keyed on the file's SHA-256
+until the file changes. `t()` mirrors the app's lookup
+(`translations[language]?.[key] || translations['en'][key] || key`), so the
+analyzer can tell which strings the UI actually shows in each language:
+
+- missing: a key from the English block that another language lacks
+- fallback: a key that renders in English, or as the raw key, for some
+  language. Every key of the English block counts, not only the literal
+  `t('key')` calls found in the source, since keys can also be built at
+  runtime.
+- wrong script: a non-English entry containing another language's script or
+  no letters of its own script, or an English entry in a native script
+- untranslated: a non-English entry that is a copy of the English text
+- mixed: Latin words (other than acronyms such as TIN, LKR, APIT) inside a
+  Sinhala or Tamil string
+
+    python -m tests.translation_index
+    python -m tests.translation_index --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from tests.taxpayer_data import load_test_data
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATIONS_PATH = os.path.join(PROJECT_ROOT, 'data', 'translations.js')
+SOURCE_DIRS = ['app', 'components', 'context', 'features', 'utils']
+
+SCRIPTS = {
+    'si': re.compile('[\u0D80-\u0DFF]'),  # Sinhala block
+    'ta': re.compile('[\u0B80-\u0BFF]'),  # Tamil block
+}
+LATIN_WORD_RE = re.compile(r'[A-Za-z][A-Za-z\'-]*')
+ACRONYM_RE = re.compile(r'^[A-Z0-9-]{2,}$')
+PLACEHOLDER_RE = re.compile(r'\{\w+\}')  # {current}, {total}, {min}
+
+OBJECT_RE = re.compile(r'export\s+const\s+translations\s*=\s*\{')
+BLOCK_RE = re.compile(r'\s*([A-Za-z_]\w*)\s*:\s*\{')
+ENTRY_RE = re.compile(r'''\s*([A-Za-z_]\w*)\s*:\s*("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')\s*,?''')
+COMMENT_RE = re.compile(r'\s*(?://[^\n]*|/\*.*?\*/)', re.S)
+T_CALL_RE = re.compile(r'''(?<![\w.])t\(\s*['"]([A-Za-z_]\w*)['"]''')
+
+_cache = {}
+
+
+def _js_string(literal):
+    """Decode a single- or double-quoted JS string literal"""
+    body = literal[1:-1]
+    if literal[0] == "'":
+        body = body.replace("\\'", "'").replace('"', '\\"')
+    return json.loads(f'"{body}"')
+
+
+def parse_translations(source):
+    """{language: {key: value}} plus [(language, key)] duplicates from translations.js"""
+    match = OBJECT_RE.search(source)
+    if match is None:
+        raise ValueError("translations.js: `export const translations = {` not found")
+    table, duplicates = {}, []
+    pos = match.end()
+    while True:
+        while (comment := COMMENT_RE.match(source, pos)):
+            pos = comment.end()
+        block = BLOCK_RE.match(source, pos)
+        if block is None:
+            break
+        language = block.group(1)
+        entries = table.setdefault(language, {})
+        pos = block.end()
+        while True:
+            while (comment := COMMENT_RE.match(source, pos)):
+                pos = comment.end()
+            entry = ENTRY_RE.match(source, pos)
+            if entry is None:
+                break
+            key = entry.group(1)
+            if key in entries:
+                duplicates.append((language, key))  # JS keeps the last one
+            entries[key] = _js_string(entry.group(2))
+            pos = entry.end()
+        closing = re.compile(r'\s*\}\s*,?').match(source, pos)
+        if closing is None:
+            line = source.count('\n', 0, pos) + 1
+            raise ValueError(f"translations.js:{line}: cannot parse entry in the {language!r} block")
+        pos = closing.end()
+    if 'en' not in table:
+        raise ValueError("translations.js: no 'en' block")
+    return table, duplicates
+
+
+def used_keys(root=PROJECT_ROOT):
+    """{key: [file:line, ...]} for every literal t('key', ...) call in the app source"""
+    usages = {}
+    for directory in SOURCE_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+            for filename in sorted(filenames):
+                if not filename.endswith(('.js', '.jsx')):
+                    continue
+                path = os.path.join(dirpath, filename)
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line_number, line in enumerate(f, 1):
+                        for key in T_CALL_RE.findall(line):
+                            usages.setdefault(key, []).append(f"{os.path.relpath(path, root)}:{line_number}")
+    return usages
+
+
+@dataclass
+class TranslationIndex:
+    """Key x language table parsed from translations.js"""
+
+    digest: str
+    table: Dict[str, Dict[str, str]]
+    duplicates: List[tuple] = field(default_factory=list)
+
+    @property
+    def languages(self):
+        return list(self.table)
+
+    @property
+    def keys(self):
+        """Every key in any language, English order first"""
+        keys = dict.fromkeys(self.table['en'])
+        for entries in self.table.values():
+            keys.update(dict.fromkeys(entries))
+        return list(keys)
+
+    def t(self, key, language='en'):
+        """What the app's t() returns"""
+        return self.table.get(language, {}).get(key) or self.table['en'].get(key) or key
+
+    def source(self, key, language):
+        """'own', 'en' (fallback to English) or 'key' (renders the raw key)"""
+        if self.table.get(language, {}).get(key):
+            return 'own'
+        return 'en' if self.table['en'].get(key) else 'key'
+
+    def missing(self):
+        """{language: [English keys it lacks]}"""
+        return {language: [key for key in self.table['en'] if not entries.get(key)]
+                for language, entries in self.table.items() if language != 'en'}
+
+    def fallbacks(self, keys):
+        """{language: {key: 'en' | 'key'}} for the given keys that are not translated"""
+        report = {}
+        for language in self.languages:
+            for key in keys:
+                source = self.source(key, language)
+                if source != 'own':
+                    report.setdefault(language, {})[key] = source
+        return report
+
+    def script_issues(self):
+        """[(language, key, kind, value)]; kind is 'wrong-script', 'untranslated' or 'mixed'"""
+        issues = []
+        for language, entries in self.table.items():
+            for key, value in entries.items():
+                if language == 'en':
+                    if any(pattern.search(value) for pattern in SCRIPTS.values()):
+                        issues.append((language, key, 'wrong-script', value))
+                    continue
+                own = SCRIPTS.get(language)
+                if own is None:
+                    continue
+                foreign = [other for other, pattern in SCRIPTS.items() if other != language and pattern.search(value)]
+                if foreign or not own.search(value):
+                    # A copy of the English text is present, so `missing` does not catch it
+                    kind = 'untranslated' if value == self.table['en'].get(key) else 'wrong-script'
+                    issues.append((language, key, kind, value))
+                elif any(not ACRONYM_RE.match(word) for word in LATIN_WORD_RE.findall(PLACEHOLDER_RE.sub('', value))):
+                    issues.append((language, key, 'mixed', value))
+        return issues
+
+    def check_keys(self, keys):
+        """[(language, key, problem)] for keys that do not render translated, native-script text"""
+        wrong = {(language, key): kind for language, key, kind, _ in self.script_issues() if kind != 'mixed'}
+        problems = []
+        for key in keys:
+            for language in self.languages:
+                source = self.source(key, language)
+                if source == 'key':
+                    problems.append((language, key, 'renders the raw key'))
+                elif source == 'en' and language != 'en':
+                    problems.append((language, key, 'falls back to English'))
+                elif (language, key) in wrong:
+                    problems.append((language, key, wrong[(language, key)].replace('-', ' ')))
+        return problems
+
+
+def load_index(path=TRANSLATIONS_PATH):
+    """The TranslationIndex for `path`, reparsed only when its SHA-256 changes"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    index = _cache.get(path)
+    if index is None or index.digest != digest:
+        table, duplicates = parse_translations(raw.decode('utf-8'))
+        index = _cache[path] = TranslationIndex(digest, table, duplicates)
+    return index
+
+
+def analyze(index=None, usages=None, test_keys=None):
+    """Full coverage report as a JSON-friendly dict"""
+    index = index or load_index()
+    usages = used_keys() if usages is None else usages
+    test_keys = load_test_data()['translation_keys'] if test_keys is None else test_keys
+    keys = list(dict.fromkeys([*usages, *index.table['en']]))
+    return {
+        'languages': {language: len(entries) for language, entries in index.table.items()},
+        'keys': len(index.keys),
+        'missing': index.missing(),
+        'fallbacks': {language: {key: {'renders': source, 'used_at': usages.get(key, [])}
+                                 for key, source in fallbacks.items()}
+                      for language, fallbacks in index.fallbacks(keys).items()},
+        'script_issues': [{'language': language, 'key': key, 'kind': kind, 'value': value}
+                          for language, key, kind, value in index.script_issues()],
+        'duplicates': [{'language': language, 'key': key} for language, key in index.duplicates],
+        'translation_keys': [{'language': language, 'key': key, 'problem': problem}
+                             for language, key, problem in index.check_keys(test_keys)],
+    }
+
+
+def failures(report):
+    """Findings that fail both the CLI and test_translation_coverage, as messages
+
+    Raw-key renders, English fallbacks, entries in the wrong script and
+    problems with test_data.json translation_keys.
+    """
+    messages = []
+    for language, keys in report['fallbacks'].items():
+        for key, entry in keys.items():
+            shown = 'the raw key' if entry['renders'] == 'key' else 'English'
+            where = entry['used_at'][0] if entry['used_at'] else 'no literal t() call'
+            messages.append(f"t('{key}') shows {shown} in {language} ({where})")
+    for issue in report['script_issues']:
+        if issue['kind'] == 'wrong-script':
+            messages.append(f"{issue['language']}.{issue['key']} is in the wrong script: {issue['value']}")
+    for problem in report['translation_keys']:
+        messages.append(f"translation_keys: {problem['language']}.{problem['key']} {problem['problem']}")
+    return messages
+
+
+def print_report(report):
+    languages = report['languages']
+    print(f"{report['keys']} keys; " + ', '.join(f"{language}: {count}" for language, count in languages.items()))
+    for language, keys in report['fallbacks'].items():
+        for key, entry in keys.items():
+            shown = 'the raw key' if entry['renders'] == 'key' else 'English'
+            where = entry['used_at'][0] if entry['used_at'] else 'no literal t() call'
+            print(f"❌ t('{key}') shows {shown} in {language} ({where})")
+    for issue in report['script_issues']:
+        icon = '❌' if issue['kind'] == 'wrong-script' else '⚠️ '
+        print(f"{icon} {issue['language']}.{issue['key']} ({issue['kind']}): {issue['value']}")
+    for duplicate in report['duplicates']:
+        print(f"⚠️  {duplicate['language']}.{duplicate['key']} is defined twice; the last one wins")
+    for problem in report['translation_keys']:
+        print(f"❌ translation_keys: {problem['language']}.{problem['key']} {problem['problem']}")
+    if not report['translation_keys']:
+        print("✅ Every key in test_data.json translation_keys is translated in every language")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check translation coverage without a browser")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze()
+    if args.json:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+    else:
+        print_report(report)
+    return 1 if failures(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
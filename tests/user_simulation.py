@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Many-user simulation of the full Step 1 -> 5 wizard flow
+
+Each simulated user gets its own BrowserContext and a synthetic profile
+(language, viewport, name, TIN, income, income sources, think time) and walks
+the flow from test_complete_flow.py. Users are split across a process pool;
+every worker drives its share from one asyncio loop and one browser, with a
+semaphore bounding its open contexts, so total concurrency is
+processes x --concurrency and hundreds of users fit on one machine.
+
+Per-user latencies (initial load, then click -> next step rendered for each
+transition) are aggregated into percentiles per step.
+
+    python -m tests.user_simulation --users 200 --processes 4 --concurrency 10
+    python -m tests.user_simulation --users 50 --ramp-up 10 --server prod
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from tests import browser_server
+from tests.app_server import managed_server
+from tests.benchmark import percentile
+from tests.selectors import BASE_URL, Selectors, TestHelpers, Waits
+from tests.taxpayer_data import generate_profiles, load_test_data
+
+DEFAULT_USERS = 20
+DEFAULT_CONCURRENCY = 5  # open contexts per process
+STEP_TIMEOUT = 15000  # ms; generous, since the server is shared by every user
+
+NEXT = '[data-testid="nav-next"]'
+SUBMIT = '[data-testid="nav-submit"]'
+STEP_WAIT_JS = f"""([selector, step]) => ({Waits.STEP_JS})(selector) === step"""
+
+
+def synthetic_profiles(count, seed=None):
+    """`count` valid profiles from taxpayer_data, each with a viewport and think time"""
+    viewports = [viewport for entries in load_test_data()['viewports'].values() for viewport in entries]
+    rng = random.Random(seed)
+    return [
+        dict(profile, user=profile['id'], viewport=rng.choice(viewports), think_ms=rng.randint(0, 500))
+        for profile in generate_profiles(count, seed or 0, invalid_ratio=0)
+    ]
+
+
+async def _to_step(page, step):
+    """Click Next and return ms until the step indicator shows `step`"""
+    start = time.perf_counter()
+    await page.locator(NEXT).click()
+    await page.wait_for_function(STEP_WAIT_JS, arg=[Selectors.STEP_INDICATOR, step], timeout=STEP_TIMEOUT)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_user(browser, semaphore, profile, base_url, think, start_at):
+    """Walk one profile through Step 1 -> 5; return its result dict"""
+    await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+    viewport = profile['viewport']
+    seed = {'currentStep': 1, 'language': profile['language'],
+            'wizardData': {'name': '', 'tin': '', 'income': '', 'sources': []}}
+    result = {'user': profile['user'], 'language': profile['language'], 'viewport': viewport['name'],
+              'passed': False, 'error': None, 'latencies': {}, 'total': 0.0}
+
+    async with semaphore:
+        start = time.perf_counter()
+        context = await browser.new_context(
+            viewport={'width': viewport['width'], 'height': viewport['height']},
+            storage_state=TestHelpers.storage_state_for(seed),
+        )
+        page = await context.new_page()
+        latencies = result['latencies']
+        think_s = profile['think_ms'] / 1000 if think else 0
+        try:
+            await page.goto(base_url)
+            await page.wait_for_function(Waits.APP_READY_JS, timeout=STEP_TIMEOUT)
+            latencies['load'] = (time.perf_counter() - start) * 1000
+
+            await page.locator(Selectors.INPUT_NAME).fill(profile['name'])
+            await page.locator(Selectors.INPUT_TIN).fill(profile['tin'])
+            await page.locator(Selectors.INPUT_INCOME).fill(profile['income'])
+            await asyncio.sleep(think_s)
+            latencies['step_1_to_2'] = await _to_step(page, 2)
+
+            for source in profile['sources']:
+                await page.locator(f'[data-testid="income-source-{source}"]').click()
+            await asyncio.sleep(think_s)
+            latencies['step_2_to_3'] = await _to_step(page, 3)
+            await asyncio.sleep(think_s)
+            latencies['step_3_to_4'] = await _to_step(page, 4)
+            await asyncio.sleep(think_s)
+            latencies['step_4_to_5'] = await _to_step(page, 5)
+
+            if not await page.locator(SUBMIT).is_visible():
+                raise AssertionError("Finish button should be visible on Step 5")
+            result['passed'] = True
+        except (AssertionError, PlaywrightError) as e:
+            result['error'] = str(e).splitlines()[0] if str(e) else type(e).__name__
+        finally:
+            await context.close()
+            result['total'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+async def simulate(profiles, concurrency=DEFAULT_CONCURRENCY, base_url=BASE_URL, think=False, ramp_up=0.0):
+    """Run `profiles` on one browser with at most `concurrency` open contexts
+
+    A profile starts `ramp_up * profile['ramp']` seconds in (run_simulation
+    sets 'ramp' to its position in [0, 1)), and only once a context slot is
+    free.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_playwright() as playwright:
+        ws_endpoint = browser_server.endpoint()
+        browser = None
+        if ws_endpoint:
+            try:
+                browser = await playwright.chromium.connect(ws_endpoint, timeout=browser_server.CONNECT_TIMEOUT)
+            except PlaywrightError:
+                pass
+        if browser is None:
+            browser = await playwright.chromium.launch(headless=True)
+        origin = time.monotonic()
+        try:
+            return await asyncio.gather(*(
+                run_user(browser, semaphore, profile, base_url, think, origin + ramp_up * profile.get('ramp', 0.0))
+                for profile in profiles
+            ))
+        finally:
+            await browser.close()
+
+
+def _run_batch(profiles, concurrency, base_url, think, ramp_up):
+    return asyncio.run(simulate(profiles, concurrency, base_url, think, ramp_up))
+
+
+def run_simulation(profiles, processes=1, concurrency=DEFAULT_CONCURRENCY, base_url=BASE_URL,
+                   think=False, ramp_up=0.0):
+    """Split `profiles` round-robin across `processes` workers; return all results"""
+    if processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}")
+    if not profiles:
+        return []
+    for position, profile in enumerate(profiles):
+        profile['ramp'] = position / len(profiles)
+    batches = [profiles[i::processes] for i in range(processes)]
+    batches = [batch for batch in batches if batch]
+    if len(batches) == 1:
+        return _run_batch(batches[0], concurrency, base_url, think, ramp_up)
+    with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+        futures = [pool.submit(_run_batch, batch, concurrency, base_url, think, ramp_up) for batch in batches]
+        return [result for future in futures for result in future.result()]
+
+
+def aggregate(results):
+    """{step metric: {'count', 'p50', 'p90', 'p99', 'max'}} in ms, over all users"""
+    samples = {}
+    for result in results:
+        for metric, ms in result['latencies'].items():
+            samples.setdefault(metric, []).append(ms)
+        if result['passed']:
+            samples.setdefault('total', []).append(result['total'])
+    return {
+        metric: {
+            'count': len(values),
+            'p50': round(percentile(values, 50), 1),
+            'p90': round(percentile(values, 90), 1),
+            'p99': round(percentile(values, 99), 1),
+            'max': round(max(values), 1),
+        }
+        for metric, values in samples.items()
+    }
+
+
+def print_report(stats, results, elapsed):
+    print(f"{'metric':<14}{'users':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for metric, s in stats.items():
+        print(f"{metric:<14}{s['count']:>7}{s['p50']:>10.1f}{s['p90']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+    failed = [result for result in results if not result['passed']]
+    for result in failed[:10]:
+        print(f"  ❌ user {result['user']} ({result['language']}, {result['viewport']}): {result['error']}")
+    if len(failed) > 10:
+        print(f"  ... and {len(failed) - 10} more")
+    print(f"{len(results) - len(failed)}/{len(results)} users completed the wizard in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.2f} users/s)")
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many users completing the wizard at once")
+    parser.add_argument('--users', type=_positive_int, default=DEFAULT_USERS,
+                        help=f"simulated users (default: {DEFAULT_USERS})")
+    parser.add_argument('--processes', type=_positive_int, default=1, help="worker processes, one browser each")
+    parser.add_argument('--concurrency', type=_positive_int, default=DEFAULT_CONCURRENCY,
+                        help=f"open contexts per process (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="seconds over which user starts are spread")
+    parser.add_argument('--think', action='store_true', help="pause each profile's think time between steps")
+    parser.add_argument('--seed', type=int, help="seed for the synthetic profiles")
+    parser.add_argument('--server', choices=['dev', 'prod'], help="start and pre-warm a server for the run")
+    parser.add_argument('--output', help="write per-user results and percentiles as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = synthetic_profiles(args.users, args.seed)
+    try:
+        with managed_server(args.server):
+            start = time.perf_counter()
+            results = run_simulation(profiles, args.processes, args.concurrency, think=args.think, ramp_up=args.ramp_up)
+            elapsed = time.perf_counter() - start
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    stats = aggregate(results)
+    print_report(stats, results, elapsed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'percentiles': stats, 'users': results}, f, indent=4, ensure_ascii=False)
+            f.write('\n')
+        print(f"✅ Results written to {args.output}")
+    return 0 if all(result['passed'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
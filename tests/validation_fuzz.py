@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Property-based fuzzing of utils/validation.js
+
+Generates batches of adversarial strings (Sinhala/Tamil/full-width digits,
+Unicode whitespace, huge numbers, exponents, malformed emails) and runs
+`formatTINInput`, `isValidTIN`, `isValidEmail`, `formatCurrencyInput` and
+`validateForm` on a whole batch per `page.evaluate` round-trip. Each result
+is checked against a Python model of the JavaScript semantics; failures are
+shrunk to minimal counterexamples, one batched round-trip per shrink pass.
+
+    python -m tests.validation_fuzz --batches 20 --batch-size 5000 --seed 1
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import sys
+import time
+
+from tests.selectors import BrowserSession
+from tests.tax_harness import PROJECT_ROOT, load_js_module
+
+VALIDATION_PATH = os.path.join(PROJECT_ROOT, 'utils', 'validation.js')
+TRANSLATIONS_PATH = os.path.join(PROJECT_ROOT, 'data', 'translations.js')
+
+# ECMAScript WhiteSpace + LineTerminator: what \s, trim() and parseFloat skip
+JS_WHITESPACE = (
+    '\t\n\v\f\r \u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009'
+    '\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+)
+_EMAIL_RE = re.compile(f"[^@{re.escape(JS_WHITESPACE)}]+@[^@{re.escape(JS_WHITESPACE)}]+\\.[^@{re.escape(JS_WHITESPACE)}]+")
+_JS_FLOAT_RE = re.compile(r'[+-]?(?:Infinity|(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)')
+_LOCALE_NUMBER_RE = re.compile(r'-?(?:[0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{1,3})?|∞)')
+
+SINHALA_DIGITS = ''.join(chr(c) for c in range(0x0DE6, 0x0DF0))
+TAMIL_DIGITS = ''.join(chr(c) for c in range(0x0BE6, 0x0BF0))
+FULLWIDTH_DIGITS = ''.join(chr(c) for c in range(0xFF10, 0xFF1A))
+ARABIC_INDIC_DIGITS = ''.join(chr(c) for c in range(0x0660, 0x066A))
+
+TOKENS = [
+    '0', '1', '9', '123', '123456789', '1234567890', '-', '+', '.', ',', 'e', 'E', 'e9', 'e-3',
+    '1e9', '1e21', '1e309', 'Infinity', '-Infinity', 'NaN', '0x1A', '0b1', '00', '\u066b',
+    ' ', '\t', '\n', '\u00a0', '\u2009', '\u3000', '\ufeff', '\u200b', '\u0085',
+    '@', '@@', 'a', 'x.lk', 'user', 'example.com', '.com', '"', "'", '<', '\\', '\U0001f600',
+    '\u0dc1\u0dca\u200d\u0dbb\u0dd3', '\u0ba4\u0bae\u0bbf\u0bb4\u0bcd',
+]
+EMAIL_TOKENS = TOKENS[TOKENS.index('@'):] + ['\u00a0', ' ', '.', '1']
+DIGIT_SETS = ['0123456789', SINHALA_DIGITS, TAMIL_DIGITS, FULLWIDTH_DIGITS, ARABIC_INDIC_DIGITS]
+
+EVALUATE_BATCH_JS = """(inputs) => {
+    const v = window.__validation;
+    const { t } = window.__translations;
+    const rules = {
+        tin: [v.validators.tin(t, 'en')],
+        email: [v.validators.email(t, 'en')],
+        income: [v.validators.required(t, 'en'), v.validators.income(t, 'en')],
+    };
+    return inputs.map((s) => [
+        v.formatTINInput(s),
+        v.isValidTIN(s),
+        v.isValidEmail(s),
+        v.formatCurrencyInput(s),
+        Object.keys(v.validateForm({ tin: s, email: s, income: s }, rules, t, 'en')).sort(),
+    ]);
+}"""
+
+
+def js_parse_float(s):
+    """Model of JavaScript parseFloat"""
+    match = _JS_FLOAT_RE.match(s.lstrip(JS_WHITESPACE))
+    if not match:
+        return math.nan
+    return float(match.group().replace('Infinity', 'inf'))
+
+
+def ascii_digits(s):
+    """Model of value.replace(/\\D/g, '') (\\d is ASCII-only without the u flag)"""
+    return ''.join(c for c in s if '0' <= c <= '9')
+
+
+def model_tin_valid(s):
+    return not s or len(ascii_digits(s)) == 9
+
+
+def model_email_valid(s):
+    return not s or _EMAIL_RE.fullmatch(s) is not None
+
+
+def model_income_valid(s):
+    number = js_parse_float(s)
+    return bool(s) and not math.isnan(number) and number >= 0
+
+
+def model_form_errors(s):
+    errors = []
+    if not s.strip(JS_WHITESPACE) or not model_income_valid(s):
+        errors.append('income')
+    if not model_email_valid(s):
+        errors.append('email')
+    if not model_tin_valid(s):
+        errors.append('tin')
+    return sorted(errors)
+
+
+def check_currency_format(s, formatted):
+    """formatCurrencyInput: unchanged when unparseable, else en-LK grouping to <= 3 decimals"""
+    number = js_parse_float(s.replace(',', ''))
+    if not s:
+        return formatted == ''
+    if math.isnan(number):
+        return formatted == s
+    if not _LOCALE_NUMBER_RE.fullmatch(formatted):
+        return False
+    shown = float(formatted.replace(',', '').replace('∞', 'inf'))
+    if math.isinf(number):
+        return shown == number
+    return math.isclose(shown, number, rel_tol=1e-15, abs_tol=0.0005 + 1e-12)
+
+
+# name -> check(input, js_result) returning True when the property holds
+PROPERTIES = {
+    'formatTINInput keeps only ASCII digits, max 9':
+        lambda s, r: r[0] == ascii_digits(s)[:9],
+    'isValidTIN means empty or exactly 9 ASCII digits':
+        lambda s, r: r[1] == model_tin_valid(s),
+    'isValidEmail matches the local@domain.tld model':
+        lambda s, r: r[2] == model_email_valid(s),
+    'formatCurrencyInput round-trips the parsed number':
+        lambda s, r: check_currency_format(s, r[3]),
+    'validateForm reports exactly the invalid fields':
+        lambda s, r: r[4] == model_form_errors(s),
+}
+
+
+def generate_input(rng):
+    """One adversarial string built from numeric, whitespace and email fragments"""
+    kind = rng.random()
+    if kind < 0.3:
+        digits = rng.choice(DIGIT_SETS)
+        body = ''.join(rng.choice(digits) for _ in range(rng.randint(0, 12)))
+        return rng.choice(['', ' ', '-', '\u00a0']) + body + rng.choice(['', ' ', '.5', 'e3', ','])
+    if kind < 0.45:
+        mantissa = rng.choice(['1', '9' * rng.randint(1, 400), f"{rng.random() * 10 ** rng.randint(0, 30):f}"])
+        return mantissa + rng.choice(['', f"e{rng.randint(-400, 400)}", 'E+9', 'e'])
+    if kind < 0.6:
+        local = ''.join(rng.choice(EMAIL_TOKENS) for _ in range(rng.randint(0, 3)))
+        domain = ''.join(rng.choice(EMAIL_TOKENS) for _ in range(rng.randint(0, 3)))
+        return f"{local}@{domain}.{rng.choice(['lk', 'com', '', ' '])}"
+    return ''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 8)))
+
+
+class ValidationFuzzer:
+    """Runs property checks for utils/validation.js against a browser page"""
+
+    def __init__(self, page, seed=0):
+        self.page = page
+        self.rng = random.Random(seed)
+        self.cases_run = 0
+        self.round_trips = 0
+
+    def load(self):
+        """Load validation.js and translations.js into a blank page"""
+        self.page.set_content("<!doctype html><title>Validation fuzzer</title>")
+        load_js_module(self.page, VALIDATION_PATH, '__validation')
+        load_js_module(self.page, TRANSLATIONS_PATH, '__translations')
+
+    def evaluate(self, inputs):
+        """Run every validation function on every input in one round-trip"""
+        self.round_trips += 1
+        self.cases_run += len(inputs)
+        return self.page.evaluate(EVALUATE_BATCH_JS, list(inputs))
+
+    def failures(self, inputs, results):
+        """Yield (property, input) for every property violated"""
+        for s, result in zip(inputs, results):
+            for name, check in PROPERTIES.items():
+                if not check(s, result):
+                    yield name, s
+
+    def shrink(self, name, value, max_passes=50):
+        """Shrink `value` to a minimal input that still violates property `name`"""
+        check = PROPERTIES[name]
+        for _ in range(max_passes):
+            candidates = _shrink_candidates(value)
+            if not candidates:
+                break
+            results = self.evaluate(candidates)
+            smaller = [s for s, r in zip(candidates, results) if not check(s, r)]
+            if not smaller:
+                break
+            value = min(smaller, key=lambda s: (len(s), s))
+        return value
+
+    def run(self, batches=10, batch_size=2000):
+        """Fuzz `batches` batches; return {property: minimal counterexample}"""
+        counterexamples = {}
+        for _ in range(batches):
+            inputs = [generate_input(self.rng) for _ in range(batch_size)]
+            results = self.evaluate(inputs)
+            for name, s in self.failures(inputs, results):
+                if name not in counterexamples:
+                    counterexamples[name] = self.shrink(name, s)
+        return counterexamples
+
+
+def _shrink_candidates(value):
+    """Strictly simpler variants: chunk deletions, then per-character simplifications"""
+    candidates = []
+    size = len(value) // 2
+    while size >= 1:
+        for start in range(0, len(value), size):
+            candidates.append(value[:start] + value[start + size:])
+        size //= 2
+    for i, char in enumerate(value):
+        for simpler in ('0', 'a', ' '):
+            if simpler < char:
+                candidates.append(value[:i] + simpler + value[i + 1:])
+    return list(dict.fromkeys(candidates))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz utils/validation.js")
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with BrowserSession.new_page() as page:
+        fuzzer = ValidationFuzzer(page, seed=args.seed)
+        fuzzer.load()
+        start = time.perf_counter()
+        counterexamples = fuzzer.run(args.batches, args.batch_size)
+        elapsed = time.perf_counter() - start
+
+    print(f"Ran {fuzzer.cases_run:,} cases in {fuzzer.round_trips} round-trips ({elapsed:.2f}s)")
+    for name, value in counterexamples.items():
+        print(f"  ❌ {name}: {value!r}")
+    return 1 if counterexamples else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
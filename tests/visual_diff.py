@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Visual regression diff engine for wizard screenshots
+
+Baselines are kept per step x language x theme x viewport under
+tests/screenshots/baselines/. A new capture is compared with a vectorized
+NumPy pixel diff: a pixel has changed when any channel moves by more than the
+threshold, and the capture fails when the share of changed pixels exceeds
+max_diff_ratio. Regions can be masked out or given their own threshold and
+ratio. On failure the diff image (baseline faded, changed pixels red, masked
+regions blue) and the actual capture are written to tests/screenshots/diffs/.
+
+Byte-identical captures are accepted without decoding, and decoding/diffing
+runs on a thread pool (Pillow and NumPy release the GIL), so hundreds of
+full-page images compare in seconds. Requires NumPy and Pillow.
+
+    python -m tests.visual_diff path/to/captures          # compare a directory against the baselines
+    VISUAL_UPDATE=1 python -m tests.test_theme_toggle     # re-record baselines
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.screenshot_store import SCREENSHOTS_DIR, _atomic_write
+
+try:
+    import numpy as np
+except ImportError:  # NumPy and Pillow are only needed by this module
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BASELINES_DIR = os.path.join(SCREENSHOTS_DIR, 'baselines')
+DIFFS_DIR = os.path.join(SCREENSHOTS_DIR, 'diffs')
+
+# Absorbs sub-pixel anti-aliasing noise without hiding real colour changes
+DEFAULT_THRESHOLD = 16
+DEFAULT_MAX_DIFF_RATIO = 0.001
+
+# Returns the page-coordinate box of the first match, for full-page captures
+ELEMENT_BOX_JS = """(selector) => {
+    const element = document.querySelector(selector);
+    if (!element) return null;
+    const rect = element.getBoundingClientRect();
+    return { x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height };
+}"""
+
+
+class Region:
+    """A rectangle of the page with its own comparison rule
+
+    `mask=True` ignores the rectangle entirely; otherwise `threshold` and
+    `max_diff_ratio` override the image-wide values inside it.
+    """
+
+    def __init__(self, name, x, y, width, height, mask=False, threshold=None, max_diff_ratio=None):
+        self.name = name
+        self.x, self.y = max(0, int(x)), max(0, int(y))
+        self.width, self.height = int(round(width)), int(round(height))
+        self.mask = mask
+        self.threshold = threshold
+        self.max_diff_ratio = max_diff_ratio
+
+    @property
+    def slice(self):
+        return (slice(self.y, self.y + self.height), slice(self.x, self.x + self.width))
+
+    def __repr__(self):
+        return f"Region({self.name!r}, {self.x}, {self.y}, {self.width}, {self.height}, mask={self.mask})"
+
+
+def region_for(page, name, selector, **rules):
+    """Build a Region covering the first element matching `selector`"""
+    box = page.evaluate(ELEMENT_BOX_JS, selector)
+    if box is None:
+        raise AssertionError(f"No element matches {selector!r} for region {name!r}")
+    return Region(name, box['x'], box['y'], box['width'], box['height'], **rules)
+
+
+def baseline_key(step, language, theme, viewport):
+    """File stem for one step x language x theme x viewport combination"""
+    return f"step{step}-{language}-{theme}-{viewport['width']}x{viewport['height']}"
+
+
+def decode_png(png):
+    """PNG bytes -> HxWx3 uint8 array"""
+    return np.asarray(Image.open(io.BytesIO(png)).convert('RGB'))
+
+
+def encode_png(pixels):
+    """HxWx3 uint8 array -> PNG bytes (fast compression; diffs are throwaway)"""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def _pad(pixels, height, width):
+    if pixels.shape[:2] == (height, width):
+        return pixels
+    padded = np.zeros((height, width, 3), dtype=np.uint8)
+    padded[:pixels.shape[0], :pixels.shape[1]] = pixels
+    return padded
+
+
+def diff_images(baseline, actual, regions=(), threshold=DEFAULT_THRESHOLD, max_diff_ratio=DEFAULT_MAX_DIFF_RATIO):
+    """Compare two HxWx3 uint8 arrays
+
+    Returns a dict with `passed`, `changed_pixels`, `ratio` for the area outside
+    any region, per-region results under `regions`, and the boolean `changed`
+    map. When the sizes differ, pixels present in only one image count as changed.
+    """
+    size_changed = baseline.shape != actual.shape
+    height = max(baseline.shape[0], actual.shape[0])
+    width = max(baseline.shape[1], actual.shape[1])
+    common_h = min(baseline.shape[0], actual.shape[0])
+    common_w = min(baseline.shape[1], actual.shape[1])
+    baseline, actual = _pad(baseline, height, width), _pad(actual, height, width)
+
+    # |a - b| without leaving uint8, then the largest channel per pixel; avoids
+    # widening to int16 and the slow reduction over the short last axis
+    channels = np.maximum(baseline, actual)
+    channels -= np.minimum(baseline, actual)
+    delta = np.maximum(np.maximum(channels[:, :, 0], channels[:, :, 1]), channels[:, :, 2])
+
+    limits = np.full((height, width), threshold, dtype=np.uint8)
+    in_region = np.zeros((height, width), dtype=bool)
+    for region in regions:
+        # 255 is the largest possible delta, so masked pixels can never change
+        limits[region.slice] = 255 if region.mask else (
+            threshold if region.threshold is None else region.threshold)
+        in_region[region.slice] = True
+
+    changed = delta > limits
+    changed[common_h:, :] |= limits[common_h:, :] < 255
+    changed[:, common_w:] |= limits[:, common_w:] < 255
+
+    outside = ~in_region
+    area = int(outside.sum())
+    changed_pixels = int(changed[outside].sum())
+    ratio = changed_pixels / area if area else 0.0
+    passed = ratio <= max_diff_ratio
+
+    region_results = {}
+    for region in regions:
+        if region.mask:
+            continue
+        region_changed = changed[region.slice]
+        region_ratio = float(region_changed.mean()) if region_changed.size else 0.0
+        limit = max_diff_ratio if region.max_diff_ratio is None else region.max_diff_ratio
+        region_results[region.name] = {
+            'changed_pixels': int(region_changed.sum()),
+            'ratio': region_ratio,
+            'passed': region_ratio <= limit,
+        }
+        passed = passed and region_ratio <= limit
+
+    return {
+        'passed': passed,
+        'changed_pixels': changed_pixels,
+        'ratio': ratio,
+        'regions': region_results,
+        'size_changed': size_changed,
+        'changed': changed,
+    }
+
+
+def render_diff(baseline, changed, regions=()):
+    """Faded baseline with changed pixels in red and masked regions tinted blue"""
+    height, width = changed.shape
+    # Green channel as a cheap stand-in for luminance, squeezed into 178-241
+    faded = _pad(baseline, height, width)[:, :, 1] // 4 + 178
+    image = np.repeat(faded[:, :, None], 3, axis=2)
+    for region in regions:
+        if region.mask:
+            image[region.slice] = (image[region.slice] * np.array([0.6, 0.7, 1.0])).astype(np.uint8)
+    image[changed] = (255, 0, 0)
+    return image
+
+
+class VisualRegression:
+    """Compares page captures with their baselines on a background thread pool"""
+
+    def __init__(self, baselines_dir=BASELINES_DIR, diffs_dir=DIFFS_DIR, threshold=DEFAULT_THRESHOLD,
+                 max_diff_ratio=DEFAULT_MAX_DIFF_RATIO, update=None, workers=None):
+        if np is None or Image is None:
+            raise ImportError("Visual regression requires NumPy and Pillow: pip install numpy pillow")
+        self.baselines_dir = baselines_dir
+        self.diffs_dir = diffs_dir
+        self.threshold = threshold
+        self.max_diff_ratio = max_diff_ratio
+        self.update = os.environ.get('VISUAL_UPDATE') == '1' if update is None else update
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix='visual-diff')
+        self._futures = []
+
+    def check(self, page, step, language, theme, viewport=None, regions=()):
+        """Capture `page` and queue its comparison; returns a future for the result"""
+        key = baseline_key(step, language, theme, viewport or page.viewport_size)
+        # Playwright's sync API is not thread-safe, so capture on the calling thread
+        return self.submit(key, page.screenshot(full_page=True, animations='disabled'), regions)
+
+    def submit(self, key, png, regions=()):
+        """Queue a comparison of PNG bytes against the baseline named `key`"""
+        future = self._executor.submit(self.compare, key, png, regions)
+        self._futures.append(future)
+        return future
+
+    def compare(self, key, png, regions=()):
+        """Compare PNG bytes with the baseline `key`; record it if there is none yet
+
+        Result status is 'passed', 'failed', 'new' (no baseline; this capture
+        was recorded as one and nothing was compared) or 'updated' (baseline
+        overwritten in update mode).
+        """
+        baseline_path = os.path.join(self.baselines_dir, f"{key}.png")
+        result = {'key': key, 'status': 'passed', 'changed_pixels': 0, 'ratio': 0.0,
+                  'regions': {}, 'diff_path': None}
+
+        if self.update or not os.path.exists(baseline_path):
+            result['status'] = 'updated' if os.path.exists(baseline_path) else 'new'
+            _atomic_write(baseline_path, png)
+            return result
+
+        with open(baseline_path, 'rb') as f:
+            baseline_png = f.read()
+        if baseline_png == png:
+            return result
+
+        baseline, actual = decode_png(baseline_png), decode_png(png)
+        diff = diff_images(baseline, actual, regions, self.threshold, self.max_diff_ratio)
+        result.update(changed_pixels=diff['changed_pixels'], ratio=diff['ratio'], regions=diff['regions'])
+        if not diff['passed']:
+            result['status'] = 'failed'
+            result['diff_path'] = os.path.join(self.diffs_dir, f"{key}.diff.png")
+            _atomic_write(result['diff_path'], encode_png(render_diff(baseline, diff['changed'], regions)))
+            _atomic_write(os.path.join(self.diffs_dir, f"{key}.actual.png"), png)
+        return result
+
+    def results(self):
+        """Wait for every queued comparison; return results in submission order"""
+        futures, self._futures = self._futures, []
+        return [future.result() for future in futures]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def describe(result):
+    """One-line summary of a comparison result"""
+    if result['status'] == 'new':
+        return f"📸 {result['key']}: no baseline; recorded this capture, not compared"
+    if result['status'] == 'updated':
+        return f"📸 {result['key']}: baseline updated"
+    icon = '✅' if result['status'] == 'passed' else '❌'
+    line = f"{icon} {result['key']}: {result['changed_pixels']} px changed ({result['ratio']:.4%})"
+    failing = [name for name, region in result['regions'].items() if not region['passed']]
+    if failing:
+        line += f", regions over tolerance: {', '.join(failing)}"
+    if result['diff_path']:
+        line += f" -> {result['diff_path']}"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare a directory of captures with the visual baselines")
+    parser.add_argument('captures', help="directory of <key>.png captures")
+    parser.add_argument('--baselines', default=BASELINES_DIR, help="baseline directory")
+    parser.add_argument('--diffs', default=DIFFS_DIR, help="where to write diff images")
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help="per-channel difference a pixel may have (0-255)")
+    parser.add_argument('--max-diff-ratio', type=float, default=DEFAULT_MAX_DIFF_RATIO,
+                        help="share of changed pixels allowed per image")
+    parser.add_argument('--update', action='store_true', help="record the captures as the new baselines")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    names = sorted(name for name in os.listdir(args.captures) if name.endswith('.png'))
+    start = time.perf_counter()
+    with VisualRegression(args.baselines, args.diffs, args.threshold, args.max_diff_ratio,
+                          update=args.update, workers=args.workers) as visual:
+        for name in names:
+            with open(os.path.join(args.captures, name), 'rb') as f:
+                visual.submit(name[:-4], f.read())
+        results = visual.results()
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result['status'] != 'passed':
+            print(describe(result))
+    failed = sum(1 for result in results if result['status'] == 'failed')
+    print(f"Compared {len(results)} images in {elapsed:.2f}s: {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())